@@ -0,0 +1,226 @@
+"""
+Throughput benchmark of BarGenerator tick-to-bar and bar-to-window generation.
+
+Synthetic tick streams are generated in chunks outside the timed section,
+so millions of ticks can be replayed with bounded memory.
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from random import Random
+from time import perf_counter
+from typing import Callable, List
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import TickData, BarData
+from vnpy.trader.session import get_session_calendar
+from vnpy.trader.utility import BarGenerator
+
+
+class LegacyBarGenerator(BarGenerator):
+    """
+    Reference implementation of the previous update_tick for comparison.
+    """
+
+    def update_tick(self, tick: TickData) -> None:
+        """"""
+        new_minute: bool = False
+
+        if not tick.last_price:
+            return
+
+        if self.last_tick and tick.datetime < self.last_tick.datetime:
+            return
+
+        if not self.bar:
+            new_minute = True
+        elif (
+                (self.bar.datetime.minute != tick.datetime.minute)
+                or (self.bar.datetime.hour != tick.datetime.hour)
+        ):
+            self.bar.datetime = self.bar.datetime.replace(
+                second=0, microsecond=0
+            )
+            self.on_bar(self.bar)
+
+            new_minute = True
+
+        if new_minute:
+            self.bar = BarData(
+                symbol=tick.symbol,
+                exchange=tick.exchange,
+                interval=Interval.MINUTE,
+                datetime=tick.datetime,
+                gateway_name=tick.gateway_name,
+                open_price=tick.last_price,
+                high_price=tick.last_price,
+                low_price=tick.last_price,
+                close_price=tick.last_price,
+                open_interest=tick.open_interest
+            )
+        else:
+            self.bar.high_price = max(self.bar.high_price, tick.last_price)
+            if tick.high_price > self.last_tick.high_price:
+                self.bar.high_price = max(self.bar.high_price, tick.high_price)
+
+            self.bar.low_price = min(self.bar.low_price, tick.last_price)
+            if tick.low_price < self.last_tick.low_price:
+                self.bar.low_price = min(self.bar.low_price, tick.low_price)
+
+            self.bar.close_price = tick.last_price
+            self.bar.open_interest = tick.open_interest
+            self.bar.datetime = tick.datetime
+
+        if self.last_tick:
+            volume_change: float = tick.volume - self.last_tick.volume
+            self.bar.volume += max(volume_change, 0)
+
+            turnover_change: float = tick.turnover - self.last_tick.turnover
+            self.bar.turnover += max(turnover_change, 0)
+
+        self.last_tick = tick
+
+
+def generate_ticks(
+    start: datetime,
+    count: int,
+    interval: timedelta,
+    rng: Random,
+    price: float
+) -> List[TickData]:
+    """
+    Generate random walk tick stream.
+    """
+    ticks: List[TickData] = []
+    dt: datetime = start
+    volume: float = 0
+    high: float = price
+    low: float = price
+
+    for _ in range(count):
+        price += rng.choice((-1, 0, 1))
+        high = max(high, price)
+        low = min(low, price)
+        volume += rng.randint(1, 10)
+
+        tick: TickData = TickData(
+            symbol="rb2410",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            last_price=price,
+            high_price=high,
+            low_price=low,
+            volume=volume,
+            turnover=volume * price,
+            open_interest=100000,
+            gateway_name="BENCHMARK"
+        )
+        ticks.append(tick)
+
+        dt += interval
+
+    return ticks
+
+
+def run_tick_benchmark(
+    generator_class: type,
+    total: int,
+    chunk_size: int,
+    seed: int
+) -> float:
+    """
+    Replay ticks into update_tick and return ticks per second.
+    """
+    bars: List[BarData] = []
+    generator: BarGenerator = generator_class(bars.append)
+
+    rng: Random = Random(seed)
+    start: datetime = datetime(2024, 1, 2, 9)
+    interval: timedelta = timedelta(milliseconds=500)
+    price: float = 3000
+
+    cost: float = 0
+    done: int = 0
+
+    while done < total:
+        count: int = min(chunk_size, total - done)
+        ticks: List[TickData] = generate_ticks(start, count, interval, rng, price)
+        start = ticks[-1].datetime + interval
+        price = ticks[-1].last_price
+
+        update_tick: Callable = generator.update_tick
+
+        t0: float = perf_counter()
+        for tick in ticks:
+            update_tick(tick)
+        cost += perf_counter() - t0
+
+        done += count
+
+    return total / cost
+
+
+def run_bar_benchmark(total: int, window: int, use_calendar: bool) -> float:
+    """
+    Replay minute bars into update_bar and return bars per second.
+    """
+    calendar = get_session_calendar(Exchange.SSE) if use_calendar else None
+
+    windows: List[BarData] = []
+    generator: BarGenerator = BarGenerator(
+        None,
+        window,
+        windows.append,
+        calendar=calendar
+    )
+
+    bars: List[BarData] = []
+    dt: datetime = datetime(2024, 1, 2, 9, 30)
+    while len(bars) < total:
+        if calendar and calendar.get_ordinal(dt) < 0:
+            dt += timedelta(minutes=1)
+            continue
+
+        bar: BarData = BarData(
+            symbol="600000",
+            exchange=Exchange.SSE,
+            interval=Interval.MINUTE,
+            datetime=dt,
+            open_price=10,
+            high_price=11,
+            low_price=9,
+            close_price=10,
+            volume=100,
+            gateway_name="BENCHMARK"
+        )
+        bars.append(bar)
+        dt += timedelta(minutes=1)
+
+    update_bar: Callable = generator.update_bar
+
+    t0: float = perf_counter()
+    for bar in bars:
+        update_bar(bar)
+    cost: float = perf_counter() - t0
+
+    return total / cost
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=2_000_000)
+    parser.add_argument("--bars", type=int, default=500_000)
+    parser.add_argument("--chunk", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    legacy: float = run_tick_benchmark(LegacyBarGenerator, args.ticks, args.chunk, args.seed)
+    print(f"update_tick legacy: {legacy:,.0f} ticks/s")
+
+    current: float = run_tick_benchmark(BarGenerator, args.ticks, args.chunk, args.seed)
+    print(f"update_tick current: {current:,.0f} ticks/s")
+    print(f"speedup: {current / legacy:.2f}x")
+
+    for use_calendar in [False, True]:
+        speed: float = run_bar_benchmark(args.bars, 5, use_calendar)
+        print(f"update_bar 5m window, calendar={use_calendar}: {speed:,.0f} bars/s")
@@ -0,0 +1,101 @@
+"""
+Benchmark of brute force optimization with chunked tasks and data
+preloaded in workers, against reloading data in every evaluation.
+
+A moving average crossover on synthetic close prices stands in for short
+backtests, where IPC and data loading dominate the cost.
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from vnpy.trader.optimize import (
+    OptimizationSetting,
+    run_bf_optimization,
+    dump_worker_data,
+    load_worker_data,
+    get_worker_data
+)
+from vnpy.trader.utility import get_folder_path
+
+
+DATA_NAME: str = "benchmark_close"
+
+
+def calculate_ma(close: np.ndarray, window: int) -> np.ndarray:
+    """"""
+    total: np.ndarray = np.cumsum(np.insert(close, 0, 0))
+    return (total[window:] - total[:-window]) / window
+
+
+def calculate_return(close: np.ndarray, fast_window: int, slow_window: int) -> float:
+    """"""
+    fast: np.ndarray = calculate_ma(close, fast_window)[slow_window - fast_window:]
+    slow: np.ndarray = calculate_ma(close, slow_window)
+
+    pos: np.ndarray = np.where(fast > slow, 1, -1)[:-1]
+    change: np.ndarray = np.diff(close[slow_window - 1:])
+    return float((pos * change).sum())
+
+
+def evaluate_reload(setting: dict) -> tuple:
+    """
+    Load data from csv file in every evaluation, like loading from database.
+    """
+    file_path: Path = get_folder_path("optimize").joinpath(f"{DATA_NAME}.csv")
+    close: np.ndarray = pd.read_csv(file_path)["close"].to_numpy()
+
+    value: float = calculate_return(close, setting["fast_window"], setting["slow_window"])
+    return (str(setting), value, {})
+
+
+def evaluate_preload(setting: dict) -> tuple:
+    """
+    Use data preloaded by worker initializer.
+    """
+    close: np.ndarray = get_worker_data()["close"]
+
+    value: float = calculate_return(close, setting["fast_window"], setting["slow_window"])
+    return (str(setting), value, {})
+
+
+def get_target(result: tuple) -> float:
+    """"""
+    return result[1]
+
+
+if __name__ == "__main__":
+    rng: np.random.Generator = np.random.default_rng(0)
+    close: np.ndarray = 100 + rng.standard_normal(200_000).cumsum() * 0.1
+
+    pd.DataFrame({"close": close}).to_csv(get_folder_path("optimize").joinpath(f"{DATA_NAME}.csv"), index=False)
+    folder_path: Path = dump_worker_data(DATA_NAME, {"close": close})
+
+    setting: OptimizationSetting = OptimizationSetting()
+    setting.add_parameter("fast_window", 2, 20, 2)
+    setting.add_parameter("slow_window", 30, 100, 5)
+    setting.set_target("return")
+
+    for name, func, chunk_size, preload in [
+        ("reload, chunk 1", evaluate_reload, 1, False),
+        ("preload, chunk 1", evaluate_preload, 1, True),
+        ("preload, chunk 8", evaluate_preload, 8, True),
+    ]:
+        start: float = perf_counter()
+
+        results: list = run_bf_optimization(
+            func,
+            setting,
+            get_target,
+            max_workers=4,
+            output=lambda msg: None,
+            chunk_size=chunk_size,
+            initializer=load_worker_data if preload else None,
+            initargs=(folder_path,) if preload else ()
+        )
+
+        cost: float = perf_counter() - start
+        print(f"{name}: {cost:.2f}s, best {results[0][0]}")
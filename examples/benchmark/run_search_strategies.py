@@ -0,0 +1,84 @@
+"""
+Benchmark counting evaluations needed by each search strategy to reach
+target score on a synthetic objective.
+
+Objective has one broad peak plus ripples. With budget less than 1, noise
+is added to the score, like backtesting on a shorter data window.
+Successive halving counts evaluations weighted by budget.
+"""
+
+from hashlib import md5
+from math import cos, exp
+from typing import Callable, Dict, List
+
+from vnpy.trader.optimize import (
+    OptimizationSetting,
+    run_bf_optimization,
+    run_ga_optimization,
+    run_sh_optimization,
+    run_bayes_optimization
+)
+
+
+CENTER: Dict[str, int] = {"a": 13, "b": 4, "c": 17, "d": 9}
+TARGET: float = 0.9
+
+
+def evaluate(setting: dict) -> tuple:
+    """"""
+    distance: float = sum((setting[k] - v) ** 2 for k, v in CENTER.items()) / 100
+    value: float = exp(-distance) + 0.05 * cos(setting["a"] * setting["b"])
+
+    budget: float = setting.get("budget", 1)
+    if budget < 1:
+        seed: int = int(md5(str(setting).encode()).hexdigest()[:8], 16)
+        value += (seed / 0xFFFFFFFF - 0.5) * 0.4 * (1 - budget)
+
+    return (str(setting), value, {"budget": budget})
+
+
+def get_target(result: tuple) -> float:
+    """"""
+    return result[1]
+
+
+class EvaluationCounter:
+    """
+    Callback counting evaluation cost until target reached.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.cost: float = 0
+        self.reached: float = 0
+
+    def __call__(self, result: tuple) -> None:
+        """"""
+        budget: float = result[2]["budget"]
+        self.cost += budget
+
+        if not self.reached and budget >= 1 and result[1] >= TARGET:
+            self.reached = self.cost
+
+
+if __name__ == "__main__":
+    setting: OptimizationSetting = OptimizationSetting()
+    for name in CENTER:
+        setting.add_parameter(name, 0, 19, 1)
+    setting.set_target("value")
+
+    quiet: Callable = lambda msg: None      # noqa
+
+    runs: List[tuple] = [
+        ("brute force", run_bf_optimization, {"chunk_size": 1000}),
+        ("genetic", run_ga_optimization, {"population_size": 100, "ngen_size": 30}),
+        ("successive halving", run_sh_optimization, {"sample_size": 729, "eta": 3, "min_budget": 1 / 9}),
+        ("bayes", run_bayes_optimization, {"n_calls": 200}),
+    ]
+
+    for name, func, kwargs in runs:
+        counter: EvaluationCounter = EvaluationCounter()
+        results: list = func(evaluate, setting, get_target, max_workers=4, output=quiet, callback=counter, **kwargs)
+
+        reached: str = f"{counter.reached:.0f}" if counter.reached else "not reached"
+        print(f"{name}: best {results[0][1]:.4f}, evaluations to target {reached}, total {counter.cost:.0f}")
@@ -0,0 +1,60 @@
+"""
+Benchmark of consecutive optimization runs with new spawn process pool
+per run, against one warm worker pool reused by all runs.
+"""
+
+from time import perf_counter
+from typing import Callable
+
+import pandas as pd     # noqa, imported in every spawned worker like strategy dependencies
+
+from vnpy.trader.optimize import (
+    OptimizationSetting,
+    WorkerPool,
+    run_bf_optimization,
+    run_ga_optimization
+)
+
+
+def evaluate(setting: dict) -> tuple:
+    """"""
+    value: float = -(setting["x"] - 7) ** 2 - (setting["y"] - 13) ** 2
+    return (str(setting), value, {})
+
+
+def get_target(result: tuple) -> float:
+    """"""
+    return result[1]
+
+
+def run_all(executor=None) -> float:
+    """
+    Run brute force and GA optimizations three times each.
+    """
+    setting: OptimizationSetting = OptimizationSetting()
+    setting.add_parameter("x", 1, 20, 1)
+    setting.add_parameter("y", 1, 20, 1)
+    setting.set_target("value")
+
+    quiet: Callable = lambda msg: None      # noqa
+
+    start: float = perf_counter()
+
+    for _ in range(3):
+        run_bf_optimization(evaluate, setting, get_target, 4, quiet, chunk_size=20, executor=executor)
+        run_ga_optimization(evaluate, setting, get_target, 4, 20, 5, quiet, executor=executor)
+
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    cold: float = run_all()
+    print(f"new spawn pool per run: {cold:.2f}s")
+
+    pool: WorkerPool = WorkerPool(4, preload=["pandas", "deap", "tqdm"])
+    pool.start()
+
+    warm: float = run_all(pool.get_executor())
+    print(f"warm worker pool: {warm:.2f}s, plus startup {pool.startup_cost:.2f}s once")
+
+    pool.shutdown()
@@ -0,0 +1,78 @@
+"""
+Demo of distributed optimization with local worker processes.
+
+Coordinator listens on rpc addresses, and workers started here could also
+be started on other machines by run_worker, as long as evaluate function
+is importable there. One worker is killed during optimization to show its
+tasks being requeued to other workers.
+"""
+
+from time import sleep
+from threading import Thread
+from typing import List
+
+from vnpy.trader.optimize import OptimizationSetting, run_bf_optimization, run_ga_optimization
+from vnpy.trader.distributed import OptimizationCoordinator, start_local_workers
+
+
+REP_ADDRESS: str = "tcp://*:2016"
+PUB_ADDRESS: str = "tcp://*:4106"
+REQ_ADDRESS: str = "tcp://localhost:2016"
+SUB_ADDRESS: str = "tcp://localhost:4106"
+
+
+def evaluate(setting: dict) -> tuple:
+    """"""
+    sleep(0.05)
+    value: float = -(setting["x"] - 7) ** 2 - (setting["y"] - 13) ** 2
+    return (str(setting), value, {})
+
+
+def get_target(result: tuple) -> float:
+    """"""
+    return result[1]
+
+
+if __name__ == "__main__":
+    coordinator: OptimizationCoordinator = OptimizationCoordinator(worker_timeout=3)
+    coordinator.start(REP_ADDRESS, PUB_ADDRESS)
+
+    processes: list = start_local_workers(REQ_ADDRESS, SUB_ADDRESS, 4)
+    while coordinator.get_worker_count() < 4:
+        sleep(0.1)
+
+    setting: OptimizationSetting = OptimizationSetting()
+    setting.add_parameter("x", 1, 20, 1)
+    setting.add_parameter("y", 1, 20, 1)
+    setting.set_target("value")
+
+    def kill_worker() -> None:
+        sleep(1)
+        processes[0].kill()
+        print("worker killed")
+
+    Thread(target=kill_worker).start()
+
+    results: List[tuple] = run_bf_optimization(
+        evaluate,
+        setting,
+        get_target,
+        max_workers=4,
+        chunk_size=5,
+        executor=coordinator
+    )
+    print(f"bf results: {len(results)}, best: {results[0][0]}")
+
+    results = run_ga_optimization(
+        evaluate,
+        setting,
+        get_target,
+        population_size=20,
+        ngen_size=5,
+        executor=coordinator
+    )
+    print(f"ga results: {len(results)}, best: {results[0][0]}")
+
+    coordinator.shutdown()
+    for process in processes:
+        process.join()
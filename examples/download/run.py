@@ -0,0 +1,103 @@
+"""
+Offline demo of HistoryDownloader with a simulated datafeed.
+
+SimulatedDatafeed returns synthetic bars after a random latency and fails
+randomly, which exercises concurrency, rate limit and retry without any
+network access or paid datafeed account.
+"""
+
+from datetime import datetime, timedelta
+from random import Random
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Callable, List, Optional
+
+from vnpy.trader.constant import Market, Interval
+from vnpy.trader.datafeed import BaseDatafeed
+from vnpy.trader.download import HistoryDownloader, DownloadTask
+from vnpy.trader.object import BarData, HistoryRequest
+
+
+class SimulatedDatafeed(BaseDatafeed):
+    """
+    Datafeed test double without network access.
+    """
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.1, seed: int = 0) -> None:
+        """"""
+        self.latency: float = latency
+        self.failure_rate: float = failure_rate
+        self.rng: Random = Random(seed)
+        self.lock: Lock = Lock()
+
+        self.request_count: int = 0
+        self.active_count: int = 0
+        self.max_active: int = 0
+
+    def query_bar_history(self, req: HistoryRequest, output: Callable = print) -> Optional[List[BarData]]:
+        """"""
+        with self.lock:
+            self.request_count += 1
+            self.active_count += 1
+            self.max_active = max(self.max_active, self.active_count)
+            failed: bool = self.rng.random() < self.failure_rate
+
+        sleep(self.latency)
+
+        with self.lock:
+            self.active_count -= 1
+
+        if failed:
+            raise ConnectionError("simulated network error")
+
+        bars: List[BarData] = []
+        dt: datetime = req.start
+        while dt <= req.end:
+            bar: BarData = BarData(
+                symbol=req.symbol,
+                exchange=req.exchange,
+                interval=req.interval,
+                datetime=dt,
+                open_price=10,
+                high_price=11,
+                low_price=9,
+                close_price=10,
+                volume=100,
+                gateway_name="SIM"
+            )
+            bars.append(bar)
+            dt += timedelta(days=1)
+
+        return bars
+
+
+if __name__ == "__main__":
+    datafeed: SimulatedDatafeed = SimulatedDatafeed()
+    datafeeds: dict = {market: datafeed for market in Market}
+
+    downloader: HistoryDownloader = HistoryDownloader(
+        datafeeds,
+        max_workers=8,
+        rate=50,
+        backoff=0.01
+    )
+
+    vt_symbols: List[str] = [f"{600000 + i}.SSE" for i in range(200)]
+    received: List[int] = []
+
+    def on_task(task: DownloadTask) -> None:
+        received.append(len(task.result))
+
+    start: float = perf_counter()
+    downloader.download_bar_data(
+        vt_symbols,
+        Interval.DAILY,
+        datetime(2023, 1, 1),
+        datetime(2023, 12, 31),
+        callback=on_task
+    )
+    cost: float = perf_counter() - start
+
+    print(f"symbols: {len(received)}, bars: {sum(received)}")
+    print(f"requests: {datafeed.request_count}, max concurrency: {datafeed.max_active}")
+    print(f"cost: {cost:.2f}s, request rate: {datafeed.request_count / cost:.1f}/s")
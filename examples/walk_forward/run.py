@@ -0,0 +1,101 @@
+"""
+Walk forward optimization of a moving average crossover on synthetic
+daily prices, with data preloaded once in a warm worker pool.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+from vnpy.trader.optimize import (
+    OptimizationSetting,
+    WorkerPool,
+    WalkForwardWindow,
+    WalkForwardResult,
+    dump_worker_data,
+    load_worker_data,
+    get_worker_data,
+    generate_walk_forward_windows,
+    run_walk_forward_optimization,
+    stitch_walk_forward_results
+)
+
+
+def calculate_ma(close: np.ndarray, window: int) -> np.ndarray:
+    """"""
+    total: np.ndarray = np.cumsum(np.insert(close, 0, 0))
+    return (total[window:] - total[:-window]) / window
+
+
+def evaluate(setting: dict) -> tuple:
+    """
+    Backtest on range of setting, using data preloaded in worker.
+    """
+    data: Dict[str, np.ndarray] = get_worker_data()
+
+    dates: np.ndarray = data["date"]
+    start_ix: int = int(np.searchsorted(dates, np.datetime64(setting["start"])))
+    end_ix: int = int(np.searchsorted(dates, np.datetime64(setting["end"])))
+
+    fast_window: int = setting["fast_window"]
+    slow_window: int = setting["slow_window"]
+
+    # Include history before start for calculating moving average
+    close: np.ndarray = data["close"][max(start_ix - slow_window, 0): end_ix]
+
+    fast: np.ndarray = calculate_ma(close, fast_window)[slow_window - fast_window:]
+    slow: np.ndarray = calculate_ma(close, slow_window)
+
+    pos: np.ndarray = np.where(fast > slow, 1, -1)[:-1]
+    pnl: np.ndarray = pos * np.diff(close[slow_window - 1:])
+
+    statistics: dict = {
+        "total_net_pnl": float(pnl.sum()),
+        "trade_count": int((np.diff(pos) != 0).sum()),
+    }
+    return (str(setting), statistics["total_net_pnl"], statistics)
+
+
+def get_target(result: tuple) -> float:
+    """"""
+    return result[1]
+
+
+if __name__ == "__main__":
+    rng: np.random.Generator = np.random.default_rng(1)
+    dates: np.ndarray = np.arange("2015-01-01", "2024-01-01", dtype="datetime64[D]")
+    close: np.ndarray = 100 + (rng.standard_normal(len(dates)) + 0.02 * np.sin(np.arange(len(dates)) / 50)).cumsum()
+
+    folder_path = dump_worker_data("walk_forward_demo", {"date": dates, "close": close})
+
+    setting: OptimizationSetting = OptimizationSetting()
+    setting.add_parameter("fast_window", 5, 30, 5)
+    setting.add_parameter("slow_window", 40, 120, 10)
+    setting.set_target("total_net_pnl")
+
+    windows: List[WalkForwardWindow] = generate_walk_forward_windows(
+        datetime(2015, 1, 1),
+        datetime(2024, 1, 1),
+        train_size=timedelta(days=730),
+        test_size=timedelta(days=180)
+    )
+
+    with WorkerPool(4, initializer=load_worker_data, initargs=(folder_path,)) as pool:
+        results: List[WalkForwardResult] = run_walk_forward_optimization(
+            evaluate,
+            setting,
+            get_target,
+            windows,
+            chunk_size=16,
+            executor=pool.get_executor()
+        )
+
+    data: Dict[str, list] = stitch_walk_forward_results(results, ["total_net_pnl", "trade_count"])
+    for i in range(len(results)):
+        print(
+            f"{data['test_start'][i]:%Y-%m-%d} - {data['test_end'][i]:%Y-%m-%d}  "
+            f"{data['setting'][i]}  pnl {data['total_net_pnl'][i]:.2f}  trades {data['trade_count'][i]}"
+        )
+
+    print(f"stitched out-of-sample pnl: {sum(data['total_net_pnl']):.2f}")
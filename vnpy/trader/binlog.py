@@ -0,0 +1,276 @@
+"""
+Streaming ingestion of binlog files into database.
+
+Binlog files are expected in text form decoded by mysqlbinlog with
+"--base64-output=DECODE-ROWS -v", where each row event looks like:
+
+    ### UPDATE `db`.`table`
+    ### WHERE
+    ###   @1=1
+    ### SET
+    ###   @1=1
+    ###   @2='abc'
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Queue, Full
+from threading import Thread, Event
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .database import BaseDatabase, get_database
+from .utility import load_json, save_json
+
+
+EVENT_PATTERN: re.Pattern = re.compile(r"^### (INSERT INTO|UPDATE|DELETE FROM) `([^`]*)`\.`([^`]*)`")
+VALUE_PATTERN: re.Pattern = re.compile(r"^###\s+@(\d+)=(.*)$")
+COMMENT_PATTERN: re.Pattern = re.compile(r"\s*/\*.*\*/\s*$")
+
+EVENT_TYPES: Dict[str, str] = {
+    "INSERT INTO": "INSERT",
+    "UPDATE": "UPDATE",
+    "DELETE FROM": "DELETE",
+}
+
+
+@dataclass
+class BinlogEvent:
+    """
+    Row event parsed from binlog file.
+
+    For UPDATE, before holds values of WHERE part and values holds SET part.
+    For DELETE, values holds values of deleted row.
+    """
+
+    type: str
+    schema: str
+    table: str
+    filename: str = ""
+    offset: int = 0
+
+    values: Dict[int, Any] = field(default_factory=dict)
+    before: Dict[int, Any] = field(default_factory=dict)
+
+
+def parse_value(text: str) -> Any:
+    """
+    Convert value text of binlog into python object.
+    """
+    text = COMMENT_PATTERN.sub("", text)
+
+    if text == "NULL":
+        return None
+
+    if len(text) >= 2 and text[0] == "'" and text[-1] == "'":
+        return text[1:-1].replace("\\'", "'")
+
+    try:
+        return int(text)
+    except ValueError:
+        pass
+
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_binlog_file(path: str, offset: int = 0) -> Iterator[BinlogEvent]:
+    """
+    Parse binlog file from byte offset incrementally.
+
+    Offset of each event yielded is the position after its last line, so
+    parsing can be resumed from it without losing or repeating events.
+    """
+    filename: str = Path(path).name
+    event: Optional[BinlogEvent] = None
+    section: str = ""
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        position: int = offset
+
+        for raw in f:
+            line: str = raw.decode("utf8", errors="replace").rstrip("\r\n")
+
+            result: re.Match = EVENT_PATTERN.match(line)
+            if result:
+                if event:
+                    yield event
+
+                event_type, schema, table = result.groups()
+                event = BinlogEvent(EVENT_TYPES[event_type], schema, table, filename)
+                section = ""
+            elif event and line.startswith("### "):
+                key: str = line[4:].strip()
+
+                if key in {"SET", "WHERE"}:
+                    section = key
+                else:
+                    result = VALUE_PATTERN.match(line)
+                    if result:
+                        index, text = result.groups()
+                        if event.type == "UPDATE" and section == "WHERE":
+                            event.before[int(index)] = parse_value(text)
+                        else:
+                            event.values[int(index)] = parse_value(text)
+            elif event:
+                yield event
+                event = None
+
+            position += len(raw)
+            if event:
+                event.offset = position
+
+        if event:
+            yield event
+
+
+class BinlogIngestor:
+    """
+    Pipeline parsing binlog files in background thread and applying row
+    events to database in bounded batches.
+
+    Offset of each file is recorded in journal file in trader dir after
+    every applied batch, so a crashed run resumes from the middle of file.
+    Events of the last batch may be applied again after crash, so apply_func
+    should be idempotent, e.g. saving with Conflict.REPLACE.
+    """
+
+    def __init__(
+        self,
+        apply_func: Callable[[List[BinlogEvent]], None],
+        journal_name: str = "binlog_ingest.json",
+        batch_size: int = 1000,
+        queue_size: int = 10,
+        output: Callable = print
+    ) -> None:
+        """"""
+        self.apply_func: Callable[[List[BinlogEvent]], None] = apply_func
+        self.journal_name: str = journal_name
+        self.batch_size: int = batch_size
+        self.queue_size: int = queue_size
+        self.output: Callable = output
+
+        self.journal: Dict[str, dict] = load_json(journal_name)
+        self.stop_event: Event = Event()
+
+    def get_file_state(self, path: str) -> dict:
+        """"""
+        return self.journal.setdefault(Path(path).name, {"offset": 0, "finished": False})
+
+    def ingest(self, paths: List[str]) -> int:
+        """
+        Ingest binlog files in order, return count of events applied.
+        """
+        queue: Queue = Queue(self.queue_size)
+
+        # Producer works on snapshot of offsets, only consumer touches journal
+        tasks: List[Tuple[str, int]] = []
+        for path in paths:
+            state: dict = self.get_file_state(path)
+            if not state["finished"]:
+                tasks.append((path, state["offset"]))
+
+        self.stop_event.clear()
+        producer: Thread = Thread(target=self.produce, args=(tasks, queue), daemon=True)
+        producer.start()
+
+        try:
+            count: int = self.consume(queue)
+        finally:
+            self.stop_event.set()
+            producer.join()
+
+        self.output(f"Binlog导入完成，事件总数{count}")
+        return count
+
+    def consume(self, queue: Queue) -> int:
+        """
+        Apply batches from queue and record file offsets.
+        """
+        count: int = 0
+
+        while True:
+            item: Any = queue.get()
+
+            if item is None:
+                break
+            elif isinstance(item, Exception):
+                raise item
+
+            path, events, offset, finished = item
+
+            if events:
+                self.apply_func(events)
+                count += len(events)
+
+            state: dict = self.get_file_state(path)
+            state["offset"] = offset
+            state["finished"] = finished
+            save_json(self.journal_name, self.journal)
+
+            if finished:
+                self.output(f"Binlog文件{Path(path).name}导入完成")
+
+        return count
+
+    def produce(self, tasks: List[Tuple[str, int]], queue: Queue) -> None:
+        """
+        Parse files from offsets into batches, which never cross file boundary.
+        """
+        try:
+            for path, offset in tasks:
+                batch: List[BinlogEvent] = []
+
+                for event in parse_binlog_file(path, offset):
+                    batch.append(event)
+                    offset = event.offset
+
+                    if len(batch) >= self.batch_size:
+                        if not self.put(queue, (path, batch, offset, False)):
+                            return
+                        batch = []
+
+                if not self.put(queue, (path, batch, offset, True)):
+                    return
+        except Exception as e:      # noqa
+            self.put(queue, e)
+            return
+
+        self.put(queue, None)
+
+    def put(self, queue: Queue, item: Any) -> bool:
+        """
+        Put item into queue, return False if consumer has stopped.
+        """
+        while not self.stop_event.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+
+def ingest_new_binlog_files(
+    ingestor: BinlogIngestor,
+    database: BaseDatabase = None,
+    path_func: Callable[[Any], str] = str
+) -> int:
+    """
+    Ingest new binlog files of database and mark them as updated.
+
+    path_func converts file record returned by get_new_binlog_files into
+    local path of decoded binlog text.
+    """
+    database = database or get_database()
+
+    binlog_files: List = database.get_new_binlog_files() or []
+    if not binlog_files:
+        return 0
+
+    count: int = ingestor.ingest([path_func(binlog_file) for binlog_file in binlog_files])
+    database.update_aliyun_binlog_files(binlog_files)
+    return count
@@ -0,0 +1,792 @@
+"""
+Local bar data cache in front of database and response cache of datafeed.
+"""
+
+import json
+import pickle
+import shutil
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, timedelta
+from enum import Enum
+from hashlib import sha1
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Callable, ContextManager, List, Dict, Tuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .constant import Interval, Exchange, Market, Conflict
+from .object import BarData, TickData, HistoryRequest
+from .database import (
+    BaseDatabase,
+    BarOverview,
+    TickOverview,
+    DB_TZ,
+    to_db_time
+)
+from .datafeed import BaseDatafeed
+from .query import DailyStatIndex, PREDICATE
+from .setting import SETTINGS
+from .utility import get_folder_path, generate_vt_symbol
+
+from ex_vnpy.object import BasicStockData, BasicIndexData, BasicSymbolData, ExBarData, SharesData, DailyStatData
+
+
+COLUMNS: List[str] = [
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "turnover",
+    "open_interest"
+]
+
+ONE_MICROSECOND: timedelta = timedelta(microseconds=1)
+
+
+class BarPartition:
+    """
+    Bars of one symbol + interval + year stored as memory-mapped npy columns.
+
+    Covered range of the partition is saved in meta file, inside which all
+    bars from database are available in cache.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """"""
+        self.path: Path = path
+        self.meta_path: Path = path.joinpath("meta.json")
+
+        self.start: datetime = None
+        self.end: datetime = None
+
+        if self.meta_path.exists():
+            with open(self.meta_path, mode="r", encoding="UTF-8") as f:
+                meta: dict = json.load(f)
+            self.start = datetime.fromisoformat(meta["start"])
+            self.end = datetime.fromisoformat(meta["end"])
+
+    def load_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Load all columns with memory map.
+        """
+        data: Dict[str, np.ndarray] = {}
+        for name in ["datetime"] + COLUMNS:
+            data[name] = np.load(self.path.joinpath(f"{name}.npy"), mmap_mode="r")
+        return data
+
+    def save_columns(self, data: Dict[str, np.ndarray], start: datetime, end: datetime) -> None:
+        """
+        Save all columns and update covered range.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        for name, array in data.items():
+            np.save(self.path.joinpath(f"{name}.npy"), array)
+
+        self.start = start
+        self.end = end
+
+        meta: dict = {"start": start.isoformat(), "end": end.isoformat()}
+        with open(self.meta_path, mode="w+", encoding="UTF-8") as f:
+            json.dump(meta, f)
+
+    def touch(self) -> None:
+        """
+        Update access time used for LRU eviction.
+        """
+        if self.meta_path.exists():
+            self.meta_path.touch()
+
+
+class CachedDatabase(BaseDatabase):
+    """
+    Transparent caching layer wrapping database object.
+
+    Bars are stored under the trader dir partitioned by symbol, interval and
+    year. Freshness is validated against get_bar_overview, only missing ranges
+    are loaded from database, and least recently used partitions are evicted
+    when cache size exceeds the limit.
+
+    Writes through this object clear affected partitions. Bars rewritten in
+    database by other processes without changing overview are only detected
+    if backend supports get_bar_update_marker, otherwise clear_cache must be
+    called for them.
+    """
+
+    def __init__(
+        self,
+        database: BaseDatabase,
+        folder_name: str = "bar_cache",
+        max_size: int = 0
+    ) -> None:
+        """"""
+        self.database: BaseDatabase = database
+        self.folder: Path = get_folder_path(folder_name)
+
+        if not max_size:
+            max_size = SETTINGS["database.cache.size"] * 1024 * 1024
+        self.max_size: int = max_size
+
+        self.lock: Lock = Lock()
+
+    def get_symbol_path(self, vt_symbol: str, interval: Interval) -> Path:
+        """"""
+        return self.folder.joinpath(f"{vt_symbol}_{interval.value}")
+
+    def get_overview(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stype: str
+    ) -> Optional[BarOverview]:
+        """
+        Query overview of bar data from database.
+        """
+        overviews: List[BarOverview] = self.database.get_bar_overview(symbol=symbol, stype=stype)
+        for overview in overviews:
+            if overview.exchange == exchange and overview.interval == interval:
+                return overview
+        return None
+
+    def check_freshness(self, symbol_path: Path, overview: BarOverview, marker: Optional[str] = None) -> None:
+        """
+        Clear cached partitions if data in database is changed.
+
+        Appending new bars only moves overview end forward and keeps
+        partitions valid, other changes invalidate the whole symbol. Change
+        of update marker is treated as rewrite, unless overview shows append.
+        """
+        overview_path: Path = symbol_path.joinpath("overview.json")
+
+        current: dict = {
+            "count": overview.count,
+            "start": to_db_time(overview.start).isoformat(),
+            "end": to_db_time(overview.end).isoformat(),
+            "marker": marker
+        }
+
+        if overview_path.exists():
+            with open(overview_path, mode="r", encoding="UTF-8") as f:
+                previous: dict = json.load(f)
+
+            if previous == current:
+                return
+
+            appended: bool = (
+                current["start"] == previous["start"]
+                and current["end"] > previous["end"]
+                and current["count"] > previous["count"]
+            )
+            if not appended:
+                shutil.rmtree(symbol_path)
+
+        symbol_path.mkdir(parents=True, exist_ok=True)
+        with open(overview_path, mode="w+", encoding="UTF-8") as f:
+            json.dump(current, f)
+
+    def load_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            stype: str = None
+    ) -> List[BarData]:
+        """
+        Load bar data from cache, query missing ranges from database.
+        """
+        with self.lock:
+            overview: BarOverview = self.get_overview(symbol, exchange, interval, stype or "CS")
+            if not overview or not overview.count:
+                return self.database.load_bar_data(symbol, exchange, interval, start, end, stype)
+
+            vt_symbol: str = generate_vt_symbol(symbol, exchange)
+            symbol_path: Path = self.get_symbol_path(vt_symbol, interval)
+            marker: Optional[str] = self.database.get_bar_update_marker(symbol, exchange, interval, stype or "CS")
+            self.check_freshness(symbol_path, overview, marker)
+
+            # Data outside overview range does not exist in database yet
+            start = max(to_db_time(start), to_db_time(overview.start))
+            end = min(to_db_time(end), to_db_time(overview.end))
+            if start > end:
+                return []
+
+            bars: List[BarData] = []
+            updated: bool = False
+
+            for year in range(start.year, end.year + 1):
+                year_start: datetime = max(start, datetime(year, 1, 1))
+                year_end: datetime = min(end, datetime(year + 1, 1, 1) - ONE_MICROSECOND)
+
+                partition: BarPartition = BarPartition(symbol_path.joinpath(str(year)))
+                updated |= self.fill_partition(partition, symbol, exchange, interval, year_start, year_end, stype)
+
+                bars.extend(
+                    self.read_partition(partition, symbol, exchange, interval, year_start, year_end, overview)
+                )
+                partition.touch()
+
+            if updated:
+                self.evict()
+
+            return bars
+
+    def fill_partition(
+        self,
+        partition: BarPartition,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        stype: str
+    ) -> bool:
+        """
+        Load missing ranges of partition from database and save into cache.
+        """
+        if partition.start is None:
+            ranges: List[Tuple[datetime, datetime]] = [(start, end)]
+            new_start, new_end = start, end
+        else:
+            ranges: List[Tuple[datetime, datetime]] = []
+            if start < partition.start:
+                ranges.append((start, partition.start - ONE_MICROSECOND))
+            if end > partition.end:
+                ranges.append((partition.end + ONE_MICROSECOND, end))
+            new_start, new_end = min(start, partition.start), max(end, partition.end)
+
+        if not ranges:
+            return False
+
+        bars: List[BarData] = []
+        for range_start, range_end in ranges:
+            bars.extend(
+                self.database.load_bar_data(symbol, exchange, interval, range_start, range_end, stype)
+            )
+
+        data: Dict[str, np.ndarray] = {
+            "datetime": np.array([to_db_time(bar.datetime) for bar in bars], dtype="datetime64[us]")
+        }
+        for name in COLUMNS:
+            data[name] = np.array([getattr(bar, name) for bar in bars], dtype=float)
+
+        if partition.start is not None:
+            old: Dict[str, np.ndarray] = partition.load_columns()
+            for name, array in data.items():
+                data[name] = np.concatenate([old[name], array])
+
+            # Close memory maps before overwriting files, required on Windows
+            del old
+
+        ix: np.ndarray = np.argsort(data["datetime"], kind="stable")
+        for name, array in data.items():
+            data[name] = array[ix]
+
+        partition.save_columns(data, new_start, new_end)
+        return True
+
+    def read_partition(
+        self,
+        partition: BarPartition,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        overview: BarOverview
+    ) -> List[BarData]:
+        """
+        Read bars within range from partition.
+        """
+        data: Dict[str, np.ndarray] = partition.load_columns()
+
+        dts: np.ndarray = data["datetime"]
+        left: int = np.searchsorted(dts, np.datetime64(start, "us"), side="left")
+        right: int = np.searchsorted(dts, np.datetime64(end, "us"), side="right")
+
+        columns: List[list] = [data[name][left:right].tolist() for name in COLUMNS]
+
+        bars: List[BarData] = []
+        for i, dt in enumerate(dts[left:right].astype(datetime)):
+            bar: BarData = BarData(
+                symbol=symbol,
+                exchange=exchange,
+                interval=interval,
+                datetime=dt.replace(tzinfo=DB_TZ),
+                symbol_id=overview.symbol_id,
+                stype=overview.stype,
+                open_price=columns[0][i],
+                high_price=columns[1][i],
+                low_price=columns[2][i],
+                close_price=columns[3][i],
+                volume=columns[4][i],
+                turnover=columns[5][i],
+                open_interest=columns[6][i],
+                gateway_name="DB"
+            )
+            bars.append(bar)
+
+        return bars
+
+    def evict(self) -> None:
+        """
+        Remove least recently used partitions until cache size is within limit.
+        """
+        partitions: List[Tuple[float, int, Path]] = []
+        total: int = 0
+
+        for meta_path in self.folder.glob("*/*/meta.json"):
+            path: Path = meta_path.parent
+            size: int = sum(f.stat().st_size for f in path.iterdir())
+            partitions.append((meta_path.stat().st_mtime, size, path))
+            total += size
+
+        partitions.sort()
+
+        for _, size, path in partitions:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(path)
+            total -= size
+
+    def clear_cache(self, vt_symbol: str, interval: Interval, years: List[int] = None) -> None:
+        """
+        Clear cached partitions of symbol.
+        """
+        with self.lock:
+            symbol_path: Path = self.get_symbol_path(vt_symbol, interval)
+            if not symbol_path.exists():
+                return
+
+            if years is None:
+                shutil.rmtree(symbol_path)
+                return
+
+            for year in years:
+                path: Path = symbol_path.joinpath(str(year))
+                if path.exists():
+                    shutil.rmtree(path)
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False, conflict: Conflict = Conflict.REPLACE) -> bool:
+        """"""
+        result: bool = self.database.save_bar_data(bars, stream, conflict)
+
+        changed: Dict[Tuple[str, Interval], set] = {}
+        for bar in bars:
+            years: set = changed.setdefault((bar.vt_symbol, bar.interval), set())
+            years.add(to_db_time(bar.datetime).year)
+
+        for (vt_symbol, interval), years in changed.items():
+            self.clear_cache(vt_symbol, interval, list(years))
+
+        return result
+
+    def save_bar_frame(
+            self,
+            frame: pd.DataFrame,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            stream: bool = False,
+            conflict: Conflict = Conflict.REPLACE
+    ) -> bool:
+        """"""
+        result: bool = self.database.save_bar_frame(frame, symbol, exchange, interval, stream, conflict)
+
+        years: List[int] = frame["datetime"].dt.year.unique().tolist()
+        self.clear_cache(generate_vt_symbol(symbol, exchange), interval, years)
+
+        return result
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False,
+                       conflict: Conflict = Conflict.REPLACE) -> bool:
+        """"""
+        return self.database.save_tick_data(ticks, stream, conflict)
+
+    def load_ex_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            stype: str = None
+    ) -> List[ExBarData]:
+        """"""
+        return self.database.load_ex_bar_data(symbol, exchange, interval, start, end, stype)
+
+    def load_daily_stat_data(
+            self,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            symbol: str = None,
+            exchange: Exchange = None,
+            stype: str = "CS"
+    ) -> List[DailyStatData]:
+        """"""
+        return self.database.load_daily_stat_data(interval, start, end, symbol, exchange, stype)
+
+    def query_daily_stat_data(
+            self,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            columns: List[str],
+            predicates: List[PREDICATE] = None,
+            symbol: str = None,
+            exchange: Exchange = None,
+            stype: str = "CS"
+    ) -> Dict[str, np.ndarray]:
+        """"""
+        return self.database.query_daily_stat_data(
+            interval, start, end, columns, predicates, symbol, exchange, stype
+        )
+
+    def get_daily_stat_index(
+            self,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            symbol: str = None,
+            exchange: Exchange = None,
+            stype: str = "CS"
+    ) -> DailyStatIndex:
+        """"""
+        return self.database.get_daily_stat_index(interval, start, end, symbol, exchange, stype)
+
+    def clear_daily_stat_index(self) -> None:
+        """"""
+        self.database.clear_daily_stat_index()
+
+    def get_bar_update_marker(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            stype: str = "CS"
+    ) -> Optional[str]:
+        """"""
+        return self.database.get_bar_update_marker(symbol, exchange, interval, stype)
+
+    def load_tick_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            start: datetime,
+            end: datetime
+    ) -> List[TickData]:
+        """"""
+        return self.database.load_tick_data(symbol, exchange, start, end)
+
+    def delete_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval
+    ) -> int:
+        """"""
+        count: int = self.database.delete_bar_data(symbol, exchange, interval)
+        self.clear_cache(generate_vt_symbol(symbol, exchange), interval)
+        return count
+
+    def delete_tick_data(
+            self,
+            symbol: str,
+            exchange: Exchange
+    ) -> int:
+        """"""
+        return self.database.delete_tick_data(symbol, exchange)
+
+    def session(self) -> ContextManager[Any]:
+        """"""
+        return self.database.session()
+
+    def close_pool(self) -> None:
+        """"""
+        self.database.close_pool()
+
+    def get_bar_overview(self, symbol_id: int = None, symbol: str = None, stype: str = "CS") -> List[BarOverview]:
+        """"""
+        return self.database.get_bar_overview(symbol_id, symbol, stype)
+
+    def get_tick_overview(self) -> List[TickOverview]:
+        """"""
+        return self.database.get_tick_overview()
+
+    def get_symbol_ids_by_market(self, s_type: str, market: Market) -> Dict[str, int]:
+        """"""
+        return self.database.get_symbol_ids_by_market(s_type, market)
+
+    def get_symbol_ids_by_symbols(self, vt_symbols: list) -> Dict[str, int]:
+        """"""
+        return self.database.get_symbol_ids_by_symbols(vt_symbols)
+
+    def get_basic_stock_data(self, markets: List[Market]) -> [Market, List[BasicStockData]]:
+        """"""
+        return self.database.get_basic_stock_data(markets)
+
+    def get_basic_index_data(self, markets: List[Market]) -> Dict[Market, List[BasicIndexData]]:
+        """"""
+        return self.database.get_basic_index_data(markets)
+
+    def get_basic_info_by_symbols(self, symbols, market: Market = Market.CN, symbol_type: str = 'CS') -> List[BasicSymbolData]:
+        """"""
+        return self.database.get_basic_info_by_symbols(symbols, market, symbol_type)
+
+    def update_daily_stat_data(self, many_data: List, conflict: Conflict = Conflict.IGNORE, new_inds: List[str] = None):
+        """"""
+        return self.database.update_daily_stat_data(many_data, conflict, new_inds)
+
+    def save_operation_log(self, type: str, op_status: str, op_time: datetime, op_info: str = ""):
+        """"""
+        return self.database.save_operation_log(type, op_status, op_time, op_info)
+
+    def save_capital_data(self, capital_data: List):
+        """"""
+        return self.database.save_capital_data(capital_data)
+
+    def save_capital_flat_data(self, capital_data: List):
+        """"""
+        return self.database.save_capital_flat_data(capital_data)
+
+    def update_stocks_meta_data(self, stocks_data):
+        """"""
+        return self.database.update_stocks_meta_data(stocks_data)
+
+    def get_capital_days(self, month_first_day, month_last_day) -> List[str]:
+        """"""
+        return self.database.get_capital_days(month_first_day, month_last_day)
+
+    def get_auction_days(self, month_first_day, month_last_day) -> List[str]:
+        """"""
+        return self.database.get_auction_days(month_first_day, month_last_day)
+
+    def get_latest_statistic_date(self):
+        """"""
+        return self.database.get_latest_statistic_date()
+
+    def get_latest_op_info(self, op_type):
+        """"""
+        return self.database.get_latest_op_info(op_type)
+
+    def update_aliyun_binlog_files(self, binlog_files: List):
+        """"""
+        return self.database.update_aliyun_binlog_files(binlog_files)
+
+    def get_new_binlog_files(self) -> List:
+        """"""
+        return self.database.get_new_binlog_files()
+
+    def get_capital_data_by_month(self, month) -> List:
+        """"""
+        return self.database.get_capital_data_by_month(month)
+
+    def get_capital_flat_data_by_symbol(self, symbol_id, start_dt: datetime = None, end_dt: datetime = None) -> List:
+        """"""
+        return self.database.get_capital_flat_data_by_symbol(symbol_id, start_dt, end_dt)
+
+    def get_latest_overview_date(self, market: Market):
+        """"""
+        return self.database.get_latest_overview_date(market)
+
+    def save_shares_data(self, bars: List[SharesData], change_starts: List = None, stream: bool = False, conflict: Conflict = Conflict.REPLACE) -> bool:
+        """"""
+        return self.database.save_shares_data(bars, change_starts, stream, conflict)
+
+
+# Seconds of response cache TTL for each datafeed method
+DATAFEED_CACHE_TTL: Dict[str, int] = {
+    "query_bar_history": 24 * 3600,
+    "query_index_bar_history": 24 * 3600,
+    "query_tick_history": 3600,
+    "index_components": 24 * 3600,
+    "get_ex_factor": 7 * 24 * 3600,
+    "get_shares": 7 * 24 * 3600,
+    "query_shares_history": 7 * 24 * 3600,
+}
+
+# Shorter TTL for intraday history requests
+INTRADAY_CACHE_TTL: int = 3600
+INTRADAY_INTERVALS: set = {Interval.MINUTE, Interval.HOUR, Interval.TICK}
+
+
+def normalize_request(obj: Any) -> Any:
+    """
+    Convert request arguments into json serializable structure.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    elif isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif is_dataclass(obj):
+        return {f.name: normalize_request(getattr(obj, f.name)) for f in fields(obj)}
+    elif isinstance(obj, dict):
+        return {str(k): normalize_request(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple, set)):
+        return [normalize_request(v) for v in obj]
+    return obj
+
+
+class CachedDatafeed(BaseDatafeed):
+    """
+    Persistent response cache wrapping datafeed object.
+
+    Responses are pickled under the trader dir keyed by normalized request,
+    expired by TTL of each method and evicted by least recent access when
+    cache size exceeds the limit.
+
+    Write time is stored in the entry for TTL check, while file mtime is
+    updated on every hit and only used for LRU eviction.
+    """
+
+    def __init__(
+        self,
+        datafeed: BaseDatafeed,
+        folder_name: str = "datafeed_cache",
+        max_size: int = 0,
+        ttl: Dict[str, int] = None
+    ) -> None:
+        """"""
+        self.datafeed: BaseDatafeed = datafeed
+        self.folder: Path = get_folder_path(folder_name)
+
+        if not max_size:
+            max_size = SETTINGS["datafeed.cache.size"] * 1024 * 1024
+        self.max_size: int = max_size
+
+        self.ttl: Dict[str, int] = dict(DATAFEED_CACHE_TTL)
+        if ttl:
+            self.ttl.update(ttl)
+
+        self.lock: Lock = Lock()
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+
+        self.total_size: int = sum(f.stat().st_size for f in self.folder.glob("*.pkl"))
+
+    def get_key(self, method: str, args: tuple) -> str:
+        """"""
+        data: list = [type(self.datafeed).__module__, method, normalize_request(args)]
+        text: str = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return sha1(text.encode("UTF-8")).hexdigest()
+
+    def get_ttl(self, method: str, args: tuple) -> int:
+        """"""
+        if args and isinstance(args[0], HistoryRequest) and args[0].interval in INTRADAY_INTERVALS:
+            return min(self.ttl.get(method, 0), INTRADAY_CACHE_TTL)
+        return self.ttl.get(method, 0)
+
+    def call(self, method: str, args: tuple, output: Callable) -> Any:
+        """
+        Return cached response if not expired, otherwise call datafeed.
+        """
+        ttl: int = self.get_ttl(method, args)
+        func: Callable = getattr(self.datafeed, method)
+        if not ttl:
+            return func(*args, output=output)
+
+        path: Path = self.folder.joinpath(f"{self.get_key(method, args)}.pkl")
+
+        with self.lock:
+            if path.exists():
+                try:
+                    with open(path, mode="rb") as f:
+                        entry: Any = pickle.load(f)
+
+                    if isinstance(entry, dict) and time() - entry.get("time", 0) < ttl:
+                        # Mtime records access time for LRU eviction
+                        path.touch(exist_ok=True)
+                        self.hit_count += 1
+                        return entry["data"]
+                except Exception:       # noqa
+                    pass
+
+        self.miss_count += 1
+        result: Any = func(*args, output=output)
+
+        # Failed query is not cached
+        if result is None:
+            return result
+
+        with self.lock:
+            if path.exists():
+                self.total_size -= path.stat().st_size
+
+            with open(path, mode="wb") as f:
+                pickle.dump({"time": time(), "data": result}, f)
+            self.total_size += path.stat().st_size
+
+            if self.total_size > self.max_size:
+                self.evict()
+
+        return result
+
+    def evict(self) -> None:
+        """
+        Remove least recently used responses until cache size is within limit.
+        """
+        files: List[Tuple[float, int, Path]] = []
+        for path in self.folder.glob("*.pkl"):
+            stat = path.stat()
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        files.sort()
+
+        self.total_size = sum(f[1] for f in files)
+        for _, size, path in files:
+            if self.total_size <= self.max_size:
+                break
+            path.unlink()
+            self.total_size -= size
+
+    def clear_cache(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        with self.lock:
+            for path in self.folder.glob("*.pkl"):
+                path.unlink()
+            self.total_size = 0
+
+    def init(self, output: Callable = print) -> bool:
+        """"""
+        return self.datafeed.init(output)
+
+    def query_bar_history(self, req: HistoryRequest, output: Callable = print) -> Optional[List[BarData]]:
+        """"""
+        return self.call("query_bar_history", (req,), output)
+
+    def query_index_bar_history(self, req: HistoryRequest, output: Callable = print) -> Optional[List[BarData]]:
+        """"""
+        return self.call("query_index_bar_history", (req,), output)
+
+    def query_tick_history(self, req: HistoryRequest, output: Callable = print) -> Optional[List[TickData]]:
+        """"""
+        return self.call("query_tick_history", (req,), output)
+
+    def handle_bar_data(self, df, symbol, exchange, interval, start, end):
+        """"""
+        return self.datafeed.handle_bar_data(df, symbol, exchange, interval, start, end)
+
+    def index_components(self, symbol, output: Callable = print):
+        """"""
+        return self.call("index_components", (symbol,), output)
+
+    def get_ex_factor(self, symbols, output: Callable = print):
+        """"""
+        return self.call("get_ex_factor", (symbols,), output)
+
+    def get_shares(self, symbols, start_date, end_date, output: Callable = print):
+        """"""
+        return self.call("get_shares", (symbols, start_date, end_date), output)
+
+    def query_shares_history(self, vt_symbols, start, end, output: Callable = print):
+        """"""
+        return self.call("query_shares_history", (vt_symbols, start, end), output)
@@ -1,19 +1,39 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from types import ModuleType
-from typing import List, Dict, Union
+from typing import Any, List, Dict, Union, Iterator, Iterable, Tuple, Callable, Optional
 from dataclasses import dataclass
 from importlib import import_module
+from itertools import islice
+import json
+from queue import Queue, LifoQueue, Empty
+from threading import Thread, Event, Lock, RLock, local
+from time import perf_counter, sleep
+from weakref import finalize
+
+import numpy as np
+import pandas as pd
 
 from .constant import Interval, Exchange, Market, Conflict
 from .object import BarData, TickData, BaseData
 from .setting import SETTINGS
-from .utility import ZoneInfo
+from .utility import ZoneInfo, extract_vt_symbol
+from .query import DailyStatIndex, PREDICATE
 
 from ex_vnpy.object import BasicStockData, BasicIndexData, BasicSymbolData, ExBarData, SharesData, DailyStatData
 
 DB_TZ = ZoneInfo(SETTINGS["database.timezone"])
 
+INTERVAL_DELTA_MAP: Dict[Interval, timedelta] = {
+    Interval.TICK: timedelta(milliseconds=500),
+    Interval.MINUTE: timedelta(minutes=1),
+    Interval.HOUR: timedelta(hours=1),
+    Interval.DAILY: timedelta(days=1),
+    Interval.WEEKLY: timedelta(weeks=1),
+}
+
 
 def convert_tz(dt: datetime) -> datetime:
     """
@@ -23,6 +43,88 @@ def convert_tz(dt: datetime) -> datetime:
     return dt.replace(tzinfo=None)
 
 
+def to_db_time(dt: datetime) -> datetime:
+    """
+    Convert datetime to naive datetime of DB_TZ, naive input is kept as is.
+    """
+    if dt.tzinfo:
+        return convert_tz(dt)
+    return dt
+
+
+# Count of recent ranges whose daily statistic index is kept
+DAILY_STAT_INDEX_SIZE: int = 4
+
+BAR_FRAME_COLUMNS: List[str] = [
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "turnover",
+    "open_interest"
+]
+
+
+def parse_op_checkpoint(op_info: Union[str, bytes, dict, None]) -> dict:
+    """
+    Parse bulk load checkpoint from op_info saved by save_checkpoint.
+
+    Backends may return op_info as str or bytes of json, or as dict already
+    decoded by json field.
+    """
+    if not op_info:
+        return {}
+
+    if isinstance(op_info, dict):
+        return op_info
+
+    try:
+        checkpoint: dict = json.loads(op_info)
+    except (ValueError, TypeError):
+        return {}
+
+    if not isinstance(checkpoint, dict):
+        return {}
+    return checkpoint
+
+
+def frame_to_bars(
+    frame: pd.DataFrame,
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    gateway_name: str = "DB"
+) -> List[BarData]:
+    """
+    Convert normalized bar frame into list of BarData.
+
+    Frame must contain datetime column and columns in BAR_FRAME_COLUMNS.
+    """
+    dts: np.ndarray = frame["datetime"].dt.to_pydatetime()
+    columns: List[list] = [frame[name].tolist() for name in BAR_FRAME_COLUMNS]
+
+    bars: List[BarData] = []
+    for dt, open_price, high_price, low_price, close_price, volume, turnover, open_interest in zip(dts, *columns):
+        bar: BarData = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            interval=interval,
+            datetime=dt,
+            open_price=open_price,
+            high_price=high_price,
+            low_price=low_price,
+            close_price=close_price,
+            volume=volume,
+            turnover=turnover,
+            open_interest=open_interest,
+            gateway_name=gateway_name
+        )
+        bars.append(bar)
+
+    return bars
+
+
 @dataclass
 class BarOverview(BaseData):
     """
@@ -52,11 +154,188 @@ class TickOverview(BaseData):
     end: datetime = None
 
 
+class ConnectionHolder:
+    """
+    Thread local box of connection, collected when owner thread exits.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        """"""
+        self.connection: Any = connection
+
+
+class ConnectionPool:
+    """
+    Pool of database connections with health check.
+
+    With thread affinity, each thread owns one connection created on first
+    use, which is required by drivers like SQLite whose connections cannot
+    be shared between threads. Connection is closed when its owner thread
+    exits, so short-lived thread pools do not leave connections behind.
+    Size is not enforced in this mode, since waiting for a connection owned
+    by another live thread could block forever.
+    """
+
+    def __init__(
+        self,
+        create_func: Callable[[], Any],
+        check_func: Callable[[Any], bool] = None,
+        close_func: Callable[[Any], None] = None,
+        size: int = 4,
+        timeout: float = 30,
+        thread_affinity: bool = False
+    ) -> None:
+        """"""
+        self.create_func: Callable[[], Any] = create_func
+        self.check_func: Callable[[Any], bool] = check_func
+        self.close_func: Callable[[Any], None] = close_func
+        self.size: int = size
+        self.timeout: float = timeout
+        self.thread_affinity: bool = thread_affinity
+
+        self.idle: LifoQueue = LifoQueue()
+        self.connections: List[Any] = []
+        self.count: int = 0
+        self.local: local = local()
+        self.lock: Lock = Lock()
+
+    def acquire(self) -> Any:
+        """
+        Borrow a healthy connection, wait if all connections are in use.
+        """
+        if self.thread_affinity:
+            holder: Optional[ConnectionHolder] = getattr(self.local, "holder", None)
+            if holder:
+                if self.check(holder.connection):
+                    return holder.connection
+                self.discard(holder.connection)
+
+            with self.lock:
+                self.count += 1
+            connection: Any = self.create()
+
+            # Holder is freed with thread local storage when thread exits
+            holder = ConnectionHolder(connection)
+            finalize(holder, self.discard, connection)
+            self.local.holder = holder
+            return connection
+
+        deadline: float = perf_counter() + self.timeout
+
+        while True:
+            try:
+                connection: Any = self.idle.get_nowait()
+            except Empty:
+                with self.lock:
+                    reserved: bool = self.count < self.size
+                    if reserved:
+                        self.count += 1
+
+                if reserved:
+                    return self.create()
+
+                remaining: float = deadline - perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError(f"获取数据库连接超时，连接池大小{self.size}")
+
+                try:
+                    connection = self.idle.get(timeout=min(remaining, 1))
+                except Empty:
+                    continue
+
+            if self.check(connection):
+                return connection
+            self.discard(connection)
+
+    def release(self, connection: Any, healthy: bool = True) -> None:
+        """
+        Return connection borrowed, broken one is closed and discarded.
+        """
+        if not healthy:
+            self.discard(connection)
+            if self.thread_affinity:
+                self.local.holder = None
+        elif not self.thread_affinity:
+            self.idle.put(connection)
+
+    def create(self) -> Any:
+        """
+        Create connection into slot already counted.
+        """
+        try:
+            connection: Any = self.create_func()
+        except Exception:
+            with self.lock:
+                self.count -= 1
+            raise
+
+        with self.lock:
+            self.connections.append(connection)
+        return connection
+
+    def check(self, connection: Any) -> bool:
+        """
+        Check health of connection, broken one is left for caller to discard.
+        """
+        if not self.check_func:
+            return True
+
+        try:
+            return bool(self.check_func(connection))
+        except Exception:       # noqa
+            return False
+
+    def discard(self, connection: Any) -> None:
+        """
+        Close connection and free its slot, ignored if already discarded.
+        """
+        with self.lock:
+            if connection not in self.connections:
+                return
+            self.connections.remove(connection)
+            self.count -= 1
+
+        if self.close_func:
+            try:
+                self.close_func(connection)
+            except Exception:       # noqa
+                pass
+
+    def close(self) -> None:
+        """
+        Close all connections of pool.
+        """
+        with self.lock:
+            connections: List[Any] = self.connections
+            self.connections = []
+            self.count = 0
+
+        while not self.idle.empty():
+            self.idle.get_nowait()
+
+        if self.close_func:
+            for connection in connections:
+                try:
+                    self.close_func(connection)
+                except Exception:       # noqa
+                    pass
+
+
+# Serialize sessions of backends without connection pool
+session_lock: RLock = RLock()
+pool_lock: Lock = Lock()
+
+
 class BaseDatabase(ABC):
     """
     Abstract database class for connecting to different database.
     """
 
+    # Backends set True to borrow connections from pool in session()
+    pool_enabled: bool = False
+    # Backends with pool set True if connection cannot be shared between threads
+    pool_thread_affinity: bool = False
+
     @abstractmethod
     def save_bar_data(self, bars: List[BarData], stream: bool = False, conflict: Conflict = Conflict.REPLACE) -> bool:
         """
@@ -64,6 +343,26 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def save_bar_frame(
+            self,
+            frame: pd.DataFrame,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            stream: bool = False,
+            conflict: Conflict = Conflict.REPLACE
+    ) -> bool:
+        """
+        Save columnar bar frame into database.
+
+        Default implementation converts frame into BarData list, backends may
+        override to write columns directly.
+        """
+        bars: List[BarData] = frame_to_bars(frame, symbol, exchange, interval)
+        if not bars:
+            return False
+        return self.save_bar_data(bars, stream, conflict)
+
     @abstractmethod
     def save_tick_data(self, ticks: List[TickData], stream: bool = False,
                        conflict: Conflict = Conflict.REPLACE) -> bool:
@@ -111,6 +410,79 @@ class BaseDatabase(ABC):
     ) -> List[DailyStatData]:
         pass
 
+    def query_daily_stat_data(
+            self,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            columns: List[str],
+            predicates: List[PREDICATE] = None,
+            symbol: str = None,
+            exchange: Exchange = None,
+            stype: str = "CS"
+    ) -> Dict[str, np.ndarray]:
+        """
+        Query daily statistic data with column projection and predicates,
+        e.g. "ma20 > close" or ("volume_ratio", ">", 2), return matching rows
+        in columnar form.
+
+        Default implementation filters in memory through DailyStatIndex,
+        which is built once per loaded range and reused by later queries,
+        backends may override to push predicates down into SQL.
+        """
+        index: DailyStatIndex = self.get_daily_stat_index(interval, start, end, symbol, exchange, stype)
+        return index.query(columns, predicates)
+
+    def get_daily_stat_index(
+            self,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            symbol: str = None,
+            exchange: Exchange = None,
+            stype: str = "CS"
+    ) -> DailyStatIndex:
+        """
+        Get index of daily statistic data in range, built on first use.
+
+        Index is cleared after bulk_update_daily_stat_data, data updated in
+        other ways requires clear_daily_stat_index to be called.
+        """
+        indexes: Dict[tuple, DailyStatIndex] = self.__dict__.setdefault("daily_stat_indexes", {})
+
+        key: tuple = (interval, start, end, symbol, exchange, stype)
+        index: DailyStatIndex = indexes.get(key, None)
+        if index:
+            return index
+
+        data: List[DailyStatData] = self.load_daily_stat_data(interval, start, end, symbol, exchange, stype)
+        index = DailyStatIndex(data)
+
+        # Keep indexes of a few recent ranges only
+        while len(indexes) >= DAILY_STAT_INDEX_SIZE:
+            indexes.pop(next(iter(indexes)))
+        indexes[key] = index
+
+        return index
+
+    def clear_daily_stat_index(self) -> None:
+        """"""
+        self.__dict__.pop("daily_stat_indexes", None)
+
+    def get_bar_update_marker(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            stype: str = "CS"
+    ) -> Optional[str]:
+        """
+        Return marker changed by any write of bar data, e.g. last update time
+        or version of symbol, used by cache to detect rewritten bars. None if
+        not supported by backend.
+        """
+        return None
+
     @abstractmethod
     def load_tick_data(
             self,
@@ -124,6 +496,103 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def load_bar_data_bulk(
+            self,
+            vt_symbols: List[str],
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            stype: str = None,
+            max_workers: int = 8
+    ) -> Dict[str, List[BarData]]:
+        """
+        Load bar data of multiple symbols, return dict keyed by vt_symbol.
+
+        Default implementation fans out load_bar_data calls over a thread
+        pool, each worker holding a pooled connection through session(). If
+        backend has no connection pool, symbols are loaded one by one since
+        its connection may not be thread-safe. Backends with native
+        multi-symbol query should override it.
+        """
+        def load(vt_symbol: str) -> List[BarData]:
+            symbol, exchange = extract_vt_symbol(vt_symbol)
+            with self.session():
+                return self.load_bar_data(symbol, exchange, interval, start, end, stype)
+
+        pool: Optional[ConnectionPool] = self.get_pool()
+        if not pool:
+            return {vt_symbol: load(vt_symbol) for vt_symbol in vt_symbols}
+
+        # Workers beyond pool size would only wait for connections
+        if not pool.thread_affinity:
+            max_workers = min(max_workers, pool.size)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            results: List[List[BarData]] = list(executor.map(load, vt_symbols))
+
+        return dict(zip(vt_symbols, results))
+
+    def iter_bar_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            interval: Interval,
+            start: datetime,
+            end: datetime,
+            stype: str = None,
+            chunk_size: int = 10000
+    ) -> Iterator[List[BarData]]:
+        """
+        Load bar data from database chunk by chunk.
+
+        Default implementation splits the range into time slices spanning
+        chunk_size intervals, so that each load_bar_data call returns at most
+        chunk_size bars. Backends may override with server side cursors.
+        """
+        span: timedelta = INTERVAL_DELTA_MAP[interval] * chunk_size
+        step: timedelta = timedelta(microseconds=1)
+
+        slice_start: datetime = start
+        while slice_start <= end:
+            slice_end: datetime = min(slice_start + span - step, end)
+
+            bars: List[BarData] = self.load_bar_data(
+                symbol, exchange, interval, slice_start, slice_end, stype
+            )
+            if bars:
+                yield bars
+
+            slice_start = slice_end + step
+
+    def iter_tick_data(
+            self,
+            symbol: str,
+            exchange: Exchange,
+            start: datetime,
+            end: datetime,
+            chunk_size: int = 100000
+    ) -> Iterator[List[TickData]]:
+        """
+        Load tick data from database chunk by chunk.
+
+        Default implementation splits the range into time slices, assuming
+        tick snapshots arrive no faster than every 500 milliseconds.
+        """
+        span: timedelta = INTERVAL_DELTA_MAP[Interval.TICK] * chunk_size
+        step: timedelta = timedelta(microseconds=1)
+
+        slice_start: datetime = start
+        while slice_start <= end:
+            slice_end: datetime = min(slice_start + span - step, end)
+
+            ticks: List[TickData] = self.load_tick_data(
+                symbol, exchange, slice_start, slice_end
+            )
+            if ticks:
+                yield ticks
+
+            slice_start = slice_end + step
+
     @abstractmethod
     def delete_bar_data(
             self,
@@ -200,6 +669,130 @@ class BaseDatabase(ABC):
     def save_capital_flat_data(self, capital_data: List):
         pass
 
+    def bulk_load(
+        self,
+        save_func: Callable[[List], None],
+        producer: Iterable,
+        op_type: str,
+        batch_size: int = 5000,
+        resume: bool = False,
+        run_key: str = "",
+        output: Callable = print
+    ) -> int:
+        """
+        Save data from producer chunk by chunk, return count of rows saved.
+
+        Every chunk is saved by one call of save_func (one transaction in
+        backend), and progress is checkpointed by save_operation_log together
+        with run_key, which identifies the job (e.g. its date range or hash of
+        parameters). With resume, rows already saved are skipped only if last
+        run of op_type did not finish and has the same run_key, which requires
+        producer to generate rows in the same order.
+        """
+        if resume and not run_key:
+            raise ValueError("断点恢复必须传入run_key")
+
+        skip: int = 0
+        if resume:
+            checkpoint: dict = parse_op_checkpoint(self.get_latest_op_info(op_type))
+            if (
+                checkpoint.get("status", "") in {"running", "failed"}
+                and checkpoint.get("key", "") == run_key
+            ):
+                skip = checkpoint.get("rows", 0)
+
+        iterator: Iterator = iter(producer)
+        if skip:
+            output(f"{op_type}从断点恢复，跳过已保存的{skip}条数据")
+            iterator = islice(iterator, skip, None)
+
+        rows: int = skip
+        chunk_count: int = 0
+
+        while True:
+            chunk: list = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+
+            try:
+                save_func(chunk)
+            except Exception:
+                self.save_checkpoint(op_type, "failed", rows, chunk_count, run_key)
+                raise
+
+            rows += len(chunk)
+            chunk_count += 1
+            self.save_checkpoint(op_type, "running", rows, chunk_count, run_key)
+
+        self.save_checkpoint(op_type, "success", rows, chunk_count, run_key)
+        return rows - skip
+
+    def save_checkpoint(
+        self,
+        op_type: str,
+        status: str,
+        rows: int,
+        chunk_count: int,
+        run_key: str = ""
+    ) -> None:
+        """
+        Save bulk load progress into operation log.
+        """
+        op_info: str = json.dumps({
+            "status": status,
+            "rows": rows,
+            "chunks": chunk_count,
+            "key": run_key
+        })
+        self.save_operation_log(op_type, status, datetime.now(), op_info)
+
+    def bulk_update_daily_stat_data(
+        self,
+        producer: Iterable,
+        conflict: Conflict = Conflict.IGNORE,
+        new_inds: List[str] = None,
+        batch_size: int = 5000,
+        op_type: str = "bulk_daily_stat",
+        resume: bool = False,
+        run_key: str = ""
+    ) -> int:
+        """
+        Chunked and resumable update_daily_stat_data.
+        """
+        def save_func(chunk: List) -> None:
+            self.update_daily_stat_data(chunk, conflict, new_inds)
+
+        try:
+            return self.bulk_load(save_func, producer, op_type, batch_size, resume, run_key)
+        finally:
+            self.clear_daily_stat_index()
+
+    def bulk_save_capital_data(
+        self,
+        producer: Iterable,
+        batch_size: int = 5000,
+        op_type: str = "bulk_capital",
+        resume: bool = False,
+        run_key: str = ""
+    ) -> int:
+        """
+        Chunked and resumable save_capital_data.
+        """
+        return self.bulk_load(self.save_capital_data, producer, op_type, batch_size, resume, run_key)
+
+    def bulk_save_capital_flat_data(
+        self,
+        producer: Iterable,
+        batch_size: int = 5000,
+        op_type: str = "bulk_capital_flat",
+        resume: bool = False,
+        run_key: str = ""
+    ) -> int:
+        """
+        Chunked and resumable save_capital_flat_data.
+        """
+        return self.bulk_load(self.save_capital_flat_data, producer, op_type, batch_size, resume, run_key)
+
     def update_stocks_meta_data(self, stocks_data):
         pass
 
@@ -212,7 +805,10 @@ class BaseDatabase(ABC):
     def get_latest_statistic_date(self):
         pass
 
-    def get_latest_op_info(self, op_type):
+    def get_latest_op_info(self, op_type: str) -> Union[str, bytes, dict, None]:
+        """
+        Return op_info of latest operation log of op_type, None if not found.
+        """
         pass
 
     def update_aliyun_binlog_files(self, binlog_files: List):
@@ -236,6 +832,89 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def create_connection(self) -> Any:
+        """
+        Create new connection for pool, required if pool_enabled.
+        """
+        pass
+
+    def check_connection(self, connection: Any) -> bool:
+        """
+        Check if connection is still usable.
+        """
+        return True
+
+    def close_connection(self, connection: Any) -> None:
+        """"""
+        connection.close()
+
+    def get_pool(self) -> Optional[ConnectionPool]:
+        """
+        Get connection pool of backend, None if pooling not supported.
+        """
+        if not self.pool_enabled:
+            return None
+
+        pool: ConnectionPool = getattr(self, "connection_pool", None)
+        if pool:
+            return pool
+
+        with pool_lock:
+            pool = getattr(self, "connection_pool", None)
+            if not pool:
+                pool = ConnectionPool(
+                    self.create_connection,
+                    self.check_connection,
+                    self.close_connection,
+                    SETTINGS["database.pool_size"],
+                    SETTINGS["database.pool_timeout"],
+                    self.pool_thread_affinity
+                )
+                self.connection_pool = pool
+
+        return pool
+
+    @contextmanager
+    def session(self) -> Iterator[Any]:
+        """
+        Borrow connection from pool for use in with block.
+
+        Nested session in the same thread reuses connection of outer one.
+        Backends without pool yield None while holding a global lock, so
+        that concurrent callers are still safe.
+        """
+        pool: Optional[ConnectionPool] = self.get_pool()
+
+        if not pool:
+            with session_lock:
+                yield None
+            return
+
+        connection: Any = getattr(pool.local, "session_connection", None)
+        if connection is not None:
+            yield connection
+            return
+
+        connection = pool.acquire()
+        pool.local.session_connection = connection
+        try:
+            yield connection
+        except Exception:
+            pool.local.session_connection = None
+            pool.release(connection, pool.check(connection))
+            raise
+        else:
+            pool.local.session_connection = None
+            pool.release(connection)
+
+    def close_pool(self) -> None:
+        """"""
+        pool: ConnectionPool = getattr(self, "connection_pool", None)
+        if pool:
+            pool.close()
+            self.connection_pool = None
+
+
 database: BaseDatabase = None
 
 
@@ -259,4 +938,404 @@ def get_database() -> BaseDatabase:
 
     # Create database object from module
     database = module.Database()
+
+    # Wrap with local bar cache if enabled
+    if SETTINGS["database.cache"]:
+        from .cache import CachedDatabase
+        database = CachedDatabase(database)
+
     return database
+
+
+class SymbolCache:
+    """
+    In-process bidirectional cache of vt_symbol, symbol_id and symbol info.
+
+    Symbol ids are loaded in bulk once per market, and misses are resolved
+    by one batched query, so hot paths only need dict lookup.
+    """
+
+    def __init__(self, database: BaseDatabase = None) -> None:
+        """"""
+        self.database: BaseDatabase = database
+
+        self.symbol_ids: Dict[str, int] = {}
+        self.vt_symbols: Dict[int, str] = {}
+        self.symbol_infos: Dict[str, BasicSymbolData] = {}
+        self.loaded_markets: set = set()
+
+        self.lock: Lock = Lock()
+
+    def get_database(self) -> BaseDatabase:
+        """"""
+        if not self.database:
+            self.database = get_database()
+        return self.database
+
+    def add_symbol_ids(self, symbol_ids: Dict[str, int]) -> None:
+        """"""
+        for vt_symbol, symbol_id in symbol_ids.items():
+            self.symbol_ids[vt_symbol] = symbol_id
+            self.vt_symbols[symbol_id] = vt_symbol
+
+    def load_market(self, market: Market, s_type: str = "CS", force: bool = False) -> None:
+        """
+        Load symbol ids of all symbols in market.
+        """
+        key: Tuple[str, Market] = (s_type, market)
+        if key in self.loaded_markets and not force:
+            return
+
+        symbol_ids: Dict[str, int] = self.get_database().get_symbol_ids_by_market(s_type, market)
+
+        with self.lock:
+            self.add_symbol_ids(symbol_ids or {})
+            self.loaded_markets.add(key)
+
+    def get_symbol_id(self, vt_symbol: str) -> Optional[int]:
+        """
+        Get symbol id of vt_symbol, query database if not cached.
+        """
+        symbol_id: int = self.symbol_ids.get(vt_symbol, None)
+        if symbol_id is None:
+            symbol_id = self.get_symbol_ids([vt_symbol]).get(vt_symbol, None)
+        return symbol_id
+
+    def get_symbol_ids(self, vt_symbols: List[str]) -> Dict[str, int]:
+        """
+        Get symbol ids of vt_symbols, query all missing ones in one batch.
+        """
+        missing: List[str] = [vt_symbol for vt_symbol in vt_symbols if vt_symbol not in self.symbol_ids]
+        if missing:
+            symbol_ids: Dict[str, int] = self.get_database().get_symbol_ids_by_symbols(missing)
+            with self.lock:
+                self.add_symbol_ids(symbol_ids or {})
+
+        return {
+            vt_symbol: self.symbol_ids[vt_symbol]
+            for vt_symbol in vt_symbols
+            if vt_symbol in self.symbol_ids
+        }
+
+    def get_vt_symbol(self, symbol_id: int) -> Optional[str]:
+        """
+        Get vt_symbol of symbol id, only cached symbols are available.
+        """
+        return self.vt_symbols.get(symbol_id, None)
+
+    def get_symbol_infos(
+        self,
+        vt_symbols: List[str],
+        market: Market = Market.CN,
+        s_type: str = "CS"
+    ) -> Dict[str, BasicSymbolData]:
+        """
+        Get basic info of vt_symbols, query all missing ones in one batch.
+        """
+        missing: List[str] = [vt_symbol for vt_symbol in vt_symbols if vt_symbol not in self.symbol_infos]
+        if missing:
+            symbols: List[str] = [extract_vt_symbol(vt_symbol)[0] for vt_symbol in missing]
+            infos: List[BasicSymbolData] = self.get_database().get_basic_info_by_symbols(symbols, market, s_type)
+
+            with self.lock:
+                for info in infos or []:
+                    vt_symbol: str = getattr(info, "vt_symbol", "")
+                    if not vt_symbol:
+                        vt_symbol = f"{info.symbol}.{info.exchange.value}"
+                    self.symbol_infos[vt_symbol] = info
+
+        return {
+            vt_symbol: self.symbol_infos[vt_symbol]
+            for vt_symbol in vt_symbols
+            if vt_symbol in self.symbol_infos
+        }
+
+    def update_stocks_meta_data(self, stocks_data) -> None:
+        """
+        Update stocks meta data into database and refresh cached symbols.
+        """
+        self.get_database().update_stocks_meta_data(stocks_data)
+
+        vt_symbols: List[str] = []
+        for data in stocks_data:
+            vt_symbol: str = getattr(data, "vt_symbol", "")
+            if not vt_symbol and hasattr(data, "symbol") and hasattr(data, "exchange"):
+                vt_symbol = f"{data.symbol}.{data.exchange.value}"
+
+            # Clear whole cache if changed symbols cannot be identified
+            if not vt_symbol:
+                self.clear()
+                return
+
+            vt_symbols.append(vt_symbol)
+
+        with self.lock:
+            for vt_symbol in vt_symbols:
+                symbol_id: int = self.symbol_ids.pop(vt_symbol, None)
+                self.vt_symbols.pop(symbol_id, None)
+                self.symbol_infos.pop(vt_symbol, None)
+
+        self.get_symbol_ids(vt_symbols)
+
+    def clear(self) -> None:
+        """"""
+        with self.lock:
+            self.symbol_ids.clear()
+            self.vt_symbols.clear()
+            self.symbol_infos.clear()
+            self.loaded_markets.clear()
+
+
+symbol_cache: SymbolCache = None
+
+
+def get_symbol_cache() -> SymbolCache:
+    """
+    Get global symbol cache of database.
+    """
+    global symbol_cache
+    if not symbol_cache:
+        symbol_cache = SymbolCache()
+    return symbol_cache
+
+
+class DatabaseRecorder:
+    """
+    Write-behind recorder for saving bar and tick data without blocking.
+
+    Data is put into queue by caller, coalesced into batches by size or time
+    and then saved into database on background thread with retry.
+    """
+
+    def __init__(
+        self,
+        database: BaseDatabase = None,
+        batch_size: int = 1000,
+        interval: float = 1.0,
+        max_retry: int = 3,
+        stream: bool = True,
+        conflict: Conflict = Conflict.REPLACE
+    ) -> None:
+        """"""
+        self.database: BaseDatabase = database
+        self.batch_size: int = batch_size
+        self.interval: float = interval
+        self.max_retry: int = max_retry
+        self.stream: bool = stream
+        self.conflict: Conflict = conflict
+
+        self.queue: Queue = Queue()
+        self.active: bool = False
+        self.thread: Thread = None
+        self.start_lock: Lock = Lock()
+
+        self.lock: Lock = Lock()
+        self.written_bars: int = 0
+        self.written_ticks: int = 0
+        self.batch_count: int = 0
+        self.failed_count: int = 0
+        self.dropped_count: int = 0
+        self.last_latency: float = 0
+        self.max_latency: float = 0
+        self.total_latency: float = 0
+
+    def start(self) -> None:
+        """
+        Start background writing thread.
+        """
+        with self.start_lock:
+            if self.active:
+                return
+
+            if not self.database:
+                self.database = get_database()
+
+            self.active = True
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+            recorders.append(self)
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Put bar data into queue.
+        """
+        if not self.active:
+            self.start()
+        self.queue.put(("bar", bar))
+
+    def update_tick(self, tick: TickData) -> None:
+        """
+        Put tick data into queue.
+        """
+        if not self.active:
+            self.start()
+        self.queue.put(("tick", tick))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until all data put before is written.
+        """
+        if not self.active:
+            return True
+
+        event: Event = Event()
+        self.queue.put(("flush", event))
+        return event.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Flush remaining data and stop background thread.
+        """
+        with self.start_lock:
+            if not self.active:
+                return
+
+            self.flush()
+
+            # Data put after flush is drained by thread before exit
+            self.active = False
+            self.thread.join()
+            self.thread = None
+
+            if self in recorders:
+                recorders.remove(self)
+
+    def run(self) -> None:
+        """"""
+        bars: List[BarData] = []
+        ticks: List[TickData] = []
+        events: List[Event] = []
+        deadline: float = perf_counter() + self.interval
+
+        while self.active:
+            timeout: float = max(deadline - perf_counter(), 0)
+
+            try:
+                type, data = self.queue.get(block=True, timeout=timeout)
+
+                if type == "bar":
+                    bars.append(data)
+                elif type == "tick":
+                    ticks.append(data)
+                else:
+                    events.append(data)
+            except Empty:
+                pass
+
+            if (
+                events
+                or len(bars) + len(ticks) >= self.batch_size
+                or perf_counter() >= deadline
+            ):
+                self.write(bars, ticks)
+                bars, ticks = [], []
+
+                for event in events:
+                    event.set()
+                events = []
+
+                deadline = perf_counter() + self.interval
+
+        # Write data left in queue and buffers before thread exits
+        while True:
+            try:
+                type, data = self.queue.get_nowait()
+            except Empty:
+                break
+
+            if type == "bar":
+                bars.append(data)
+            elif type == "tick":
+                ticks.append(data)
+            else:
+                events.append(data)
+
+        self.write(bars, ticks)
+
+        for event in events:
+            event.set()
+
+    def write(self, bars: List[BarData], ticks: List[TickData]) -> None:
+        """
+        Save batch grouped by symbol into database.
+        """
+        bar_groups: Dict[Tuple[str, Interval], List[BarData]] = {}
+        for bar in bars:
+            bar_groups.setdefault((bar.vt_symbol, bar.interval), []).append(bar)
+
+        tick_groups: Dict[str, List[TickData]] = {}
+        for tick in ticks:
+            tick_groups.setdefault(tick.vt_symbol, []).append(tick)
+
+        for data in bar_groups.values():
+            if self.save(self.database.save_bar_data, data):
+                with self.lock:
+                    self.written_bars += len(data)
+
+        for data in tick_groups.values():
+            if self.save(self.database.save_tick_data, data):
+                with self.lock:
+                    self.written_ticks += len(data)
+
+    def save(self, func: callable, data: list) -> bool:
+        """
+        Call database save function with retry.
+        """
+        for n in range(self.max_retry + 1):
+            start: float = perf_counter()
+
+            try:
+                func(data, self.stream, self.conflict)
+            except Exception as e:      # noqa
+                with self.lock:
+                    self.failed_count += 1
+
+                if n < self.max_retry:
+                    sleep(0.1 * 2 ** n)
+                    continue
+
+                with self.lock:
+                    self.dropped_count += len(data)
+
+                print(f"数据库写入失败，丢弃{len(data)}条数据：{e}")
+                return False
+
+            latency: float = perf_counter() - start
+            with self.lock:
+                self.batch_count += 1
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                self.total_latency += latency
+
+            return True
+
+    def get_metrics(self) -> dict:
+        """
+        Get queue depth and write latency metrics.
+        """
+        with self.lock:
+            avg_latency: float = self.total_latency / self.batch_count if self.batch_count else 0
+
+            return {
+                "queue_depth": self.queue.qsize(),
+                "written_bars": self.written_bars,
+                "written_ticks": self.written_ticks,
+                "batch_count": self.batch_count,
+                "failed_count": self.failed_count,
+                "dropped_count": self.dropped_count,
+                "last_latency": self.last_latency,
+                "avg_latency": avg_latency,
+                "max_latency": self.max_latency,
+            }
+
+
+recorders: List[DatabaseRecorder] = []
+
+
+def close_recorders() -> None:
+    """
+    Flush and stop all active database recorders.
+    """
+    for recorder in list(recorders):
+        recorder.close()
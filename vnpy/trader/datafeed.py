@@ -1,19 +1,37 @@
 from abc import ABC
+from datetime import datetime, tzinfo
 from types import ModuleType
 from typing import Optional, List, Callable, Dict
 from importlib import import_module
 
+import pandas as pd
+
 from ex_vnpy.object import SharesData
 from .constant import Market
 from .object import HistoryRequest, TickData, BarData
+from .database import DB_TZ, BAR_FRAME_COLUMNS, frame_to_bars
 from .setting import SETTINGS
 
 
+PRICE_COLUMNS: List[str] = ["open_price", "high_price", "low_price", "close_price"]
+
+
 class BaseDatafeed(ABC):
     """
     Abstract datafeed class for connecting to different datafeed.
     """
 
+    # Column names of provider DataFrame mapped to BarData field names
+    bar_columns: Dict[str, str] = {
+        "open": "open_price",
+        "high": "high_price",
+        "low": "low_price",
+        "close": "close_price",
+    }
+
+    # Timezone of naive datetime in provider DataFrame, DB_TZ if not set
+    bar_timezone: tzinfo = None
+
     def init(self, output: Callable = print) -> bool:
         """
         Initialize datafeed service connection.
@@ -43,7 +61,65 @@ class BaseDatafeed(ABC):
         convert df to List[BarData]
 
         """
-        return []
+        frame: pd.DataFrame = self.convert_bar_frame(df, start, end)
+        return frame_to_bars(frame, symbol, exchange, interval, "DATAFEED")
+
+    def convert_bar_frame(
+        self,
+        df: pd.DataFrame,
+        start: datetime = None,
+        end: datetime = None
+    ) -> pd.DataFrame:
+        """
+        Normalize provider DataFrame into columnar bar frame.
+
+        Column renaming, timezone conversion to DB_TZ, dtype coercion and
+        range filtering are done on whole columns. Rows with missing or
+        unparseable prices are dropped, while missing volume, turnover and
+        open interest default to 0. Result can be converted by frame_to_bars
+        or passed to BaseDatabase.save_bar_frame directly.
+        """
+        df = df.rename(columns=self.bar_columns)
+
+        if "datetime" not in df.columns:
+            df = df.reset_index().rename(columns={df.index.name or "index": "datetime"})
+
+        dt: pd.Series = pd.to_datetime(df["datetime"])
+        if dt.dt.tz is None:
+            dt = dt.dt.tz_localize(self.bar_timezone or DB_TZ)
+        dt = dt.dt.tz_convert(DB_TZ)
+
+        frame: pd.DataFrame = pd.DataFrame({"datetime": dt})
+        for name in BAR_FRAME_COLUMNS:
+            if name in df.columns:
+                frame[name] = pd.to_numeric(df[name], errors="coerce").astype("float64")
+            elif name in PRICE_COLUMNS:
+                raise ValueError(f"K线数据缺少价格字段{name}")
+            else:
+                frame[name] = 0.0
+
+        for name in BAR_FRAME_COLUMNS:
+            if name not in PRICE_COLUMNS:
+                frame[name] = frame[name].fillna(0)
+
+        mask: pd.Series = frame["datetime"].notna() & frame[PRICE_COLUMNS].notna().all(axis=1)
+        if start:
+            mask &= frame["datetime"] >= self.to_timestamp(start)
+        if end:
+            mask &= frame["datetime"] <= self.to_timestamp(end)
+
+        frame = frame[mask].sort_values("datetime", kind="stable")
+        frame = frame.drop_duplicates("datetime", keep="last")
+        return frame.reset_index(drop=True)
+
+    def to_timestamp(self, dt: datetime) -> pd.Timestamp:
+        """
+        Convert datetime into timestamp of DB_TZ for comparison.
+        """
+        ts: pd.Timestamp = pd.Timestamp(dt)
+        if ts.tz is None:
+            ts = ts.tz_localize(DB_TZ)
+        return ts.tz_convert(DB_TZ)
 
     def index_components(self, symbol, output: Callable = print):
         """
@@ -67,6 +143,17 @@ class BaseDatafeed(ABC):
         output("查询股本信息失败：没有正确配置数据服务")
 
 
+def wrap_datafeed(datafeed: BaseDatafeed) -> BaseDatafeed:
+    """
+    Wrap datafeed with persistent response cache if enabled.
+    """
+    if not SETTINGS["datafeed.cache"] or type(datafeed) is BaseDatafeed:
+        return datafeed
+
+    from .cache import CachedDatafeed
+    return CachedDatafeed(datafeed)
+
+
 datafeed: BaseDatafeed = None
 
 
@@ -99,6 +186,7 @@ def get_datafeed() -> BaseDatafeed:
 
             print(f"无法加载数据服务模块，请运行 pip install {module_name} 尝试安装")
 
+    datafeed = wrap_datafeed(datafeed)
     return datafeed
 
 
@@ -137,6 +225,6 @@ def get_datafeeds() -> Dict[Market, BaseDatafeed]:
             password: str = SETTINGS["datafeed.password.{}".format(datafeed_name)]
             dataf = module.Datafeed(username, password)
 
-            datafeeds[m] = dataf
+            datafeeds[m] = wrap_datafeed(dataf)
 
     return datafeeds
@@ -0,0 +1,284 @@
+"""
+Distributed executor for running optimization on worker nodes over rpc.
+"""
+
+import os
+import socket
+import traceback
+from collections import deque
+from concurrent.futures import Executor, Future
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from threading import Lock, Thread
+from time import time, sleep
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from vnpy.rpc import RpcServer, RpcClient
+from vnpy.rpc.client import RemoteException
+
+
+STOP_TOPIC: str = "optimization_stop"
+
+
+class RemoteTask:
+    """
+    Function call to be run by worker.
+    """
+
+    def __init__(self, task_id: int, func: Callable, args: tuple, kwargs: dict) -> None:
+        """"""
+        self.task_id: int = task_id
+        self.func: Callable = func
+        self.args: tuple = args
+        self.kwargs: dict = kwargs
+
+        self.future: Future = Future()
+        self.worker_id: str = ""
+
+
+class OptimizationCoordinator(RpcServer, Executor):
+    """
+    Executor handing out tasks to workers connected by rpc.
+
+    Workers pull tasks and send back results. A worker without heartbeat
+    for worker_timeout seconds is treated as lost, and tasks assigned to it
+    are put back into queue for other workers.
+    """
+
+    def __init__(self, worker_timeout: float = 30) -> None:
+        """"""
+        super().__init__()
+
+        self.worker_timeout: float = worker_timeout
+
+        self.task_count: int = 0
+        self.queue: Deque[RemoteTask] = deque()
+        self.running_tasks: Dict[int, RemoteTask] = {}
+        self.workers: Dict[str, float] = {}
+        self.task_lock: Lock = Lock()
+
+        self.register(self.register_worker)
+        self.register(self.fetch_task)
+        self.register(self.submit_result)
+        self.register(self.heartbeat)
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        """
+        Put function call into queue for workers.
+        """
+        with self.task_lock:
+            self.task_count += 1
+            task: RemoteTask = RemoteTask(self.task_count, fn, args, kwargs)
+            self.queue.append(task)
+
+        return task.future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop workers and rpc server.
+        """
+        if cancel_futures:
+            with self.task_lock:
+                for task in self.queue:
+                    task.future.cancel()
+                self.queue.clear()
+
+        if wait:
+            while True:
+                with self.task_lock:
+                    if not self.queue and not self.running_tasks:
+                        break
+                sleep(0.1)
+
+        if self.is_active():
+            self.publish(STOP_TOPIC, None)
+            self.stop()
+            self.join()
+
+    def get_worker_count(self) -> int:
+        """"""
+        with self.task_lock:
+            return len(self.workers)
+
+    def register_worker(self, worker_id: str) -> bool:
+        """"""
+        with self.task_lock:
+            self.workers[worker_id] = time()
+        return True
+
+    def heartbeat(self, worker_id: str) -> bool:
+        """"""
+        with self.task_lock:
+            if worker_id not in self.workers:
+                return False
+
+            self.workers[worker_id] = time()
+        return True
+
+    def fetch_task(self, worker_id: str) -> Optional[Tuple[int, Callable, tuple, dict]]:
+        """
+        Assign next task in queue to worker.
+        """
+        with self.task_lock:
+            self.workers[worker_id] = time()
+
+            while self.queue:
+                task: RemoteTask = self.queue.popleft()
+
+                # Task requeued from lost worker is already running
+                if not task.future.running() and not task.future.set_running_or_notify_cancel():
+                    continue
+
+                task.worker_id = worker_id
+                self.running_tasks[task.task_id] = task
+                return task.task_id, task.func, task.args, task.kwargs
+
+        return None
+
+    def submit_result(self, worker_id: str, task_id: int, success: bool, result: Any) -> bool:
+        """
+        Receive result of task from worker.
+        """
+        with self.task_lock:
+            self.workers[worker_id] = time()
+
+            task: RemoteTask = self.running_tasks.pop(task_id, None)
+
+            # Result of requeued task may arrive more than once
+            if not task or task.future.done():
+                return False
+
+        if success:
+            task.future.set_result(result)
+        else:
+            task.future.set_exception(RemoteException(result))
+        return True
+
+    def check_heartbeat(self) -> None:
+        """
+        Requeue tasks of lost workers when checking heartbeat.
+        """
+        super().check_heartbeat()
+
+        now: float = time()
+
+        with self.task_lock:
+            lost: Set[str] = {
+                worker_id for worker_id, last in self.workers.items()
+                if now - last > self.worker_timeout
+            }
+            if not lost:
+                return
+
+            for worker_id in lost:
+                self.workers.pop(worker_id)
+
+            for task_id, task in list(self.running_tasks.items()):
+                if task.worker_id in lost:
+                    self.running_tasks.pop(task_id)
+                    self.queue.appendleft(task)
+
+
+class OptimizationWorker(RpcClient):
+    """
+    Worker pulling tasks from coordinator and running them one by one.
+    """
+
+    def __init__(self, heartbeat_interval: float = 5, poll_interval: float = 0.1) -> None:
+        """"""
+        super().__init__()
+
+        self.heartbeat_interval: float = heartbeat_interval
+        self.poll_interval: float = poll_interval
+
+        self.worker_id: str = f"{socket.gethostname()}_{os.getpid()}"
+        self.worker_active: bool = False
+
+    def callback(self, topic: str, data: Any) -> None:
+        """"""
+        if topic == STOP_TOPIC:
+            # Hold request lock, so that socket is not closed during rpc call
+            with self._lock:
+                self.worker_active = False
+                self.stop()
+
+    def run_tasks(self, req_address: str, sub_address: str) -> int:
+        """
+        Run tasks until coordinator stops, return count of tasks finished.
+        """
+        # Messages are pickled with topic, so prefix filter is not usable
+        self.subscribe_topic("")
+        self.start(req_address, sub_address)
+
+        self.worker_active = True
+        count: int = 0
+
+        heartbeat_thread: Thread = Thread(target=self.run_heartbeat, daemon=True)
+
+        try:
+            self.register_worker(self.worker_id)
+            heartbeat_thread.start()
+
+            while self.worker_active:
+                task: Optional[tuple] = self.fetch_task(self.worker_id)
+                if not task:
+                    sleep(self.poll_interval)
+                    continue
+
+                task_id, func, args, kwargs = task
+                try:
+                    result: Any = func(*args, **kwargs)
+                    success: bool = True
+                except Exception:   # noqa
+                    result = traceback.format_exc()
+                    success = False
+
+                self.submit_result(self.worker_id, task_id, success, result)
+                count += 1
+        except Exception as e:      # noqa
+            # Rpc fails once socket closed by stop message
+            if self.worker_active:
+                print(f"优化工作进程{self.worker_id}异常退出：{e}")
+
+        self.worker_active = False
+        self.stop()
+        self.join()
+
+        return count
+
+    def run_heartbeat(self) -> None:
+        """"""
+        while self.worker_active:
+            sleep(self.heartbeat_interval)
+
+            try:
+                if self.worker_active:
+                    self.heartbeat(self.worker_id)
+            except Exception:       # noqa
+                return
+
+
+def run_worker(req_address: str, sub_address: str) -> int:
+    """
+    Run one optimization worker in current process.
+    """
+    worker: OptimizationWorker = OptimizationWorker()
+    return worker.run_tasks(req_address, sub_address)
+
+
+def start_local_workers(req_address: str, sub_address: str, count: int) -> List[BaseProcess]:
+    """
+    Start worker processes on local machine.
+    """
+    processes: List[BaseProcess] = []
+
+    for _ in range(count):
+        process: BaseProcess = get_context("spawn").Process(
+            target=run_worker,
+            args=(req_address, sub_address),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+
+    return processes
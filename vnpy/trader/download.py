@@ -0,0 +1,288 @@
+"""
+Parallel and rate-limited history data downloader over datafeeds.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from random import random
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, List, Optional
+
+from .constant import Interval, Market, Conflict
+from .object import BarData, HistoryRequest
+from .database import DatabaseRecorder
+from .datafeed import BaseDatafeed, get_datafeeds
+from .utility import extract_vt_symbol, exchange_to_market
+
+
+class RateLimiter:
+    """
+    Token bucket limiting request rate per second.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """"""
+        self.rate: float = rate
+        self.burst: int = burst
+
+        self.tokens: float = burst
+        self.timestamp: float = perf_counter()
+        self.lock: Lock = Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available.
+        """
+        if not self.rate:
+            return
+
+        while True:
+            with self.lock:
+                now: float = perf_counter()
+                self.tokens = min(self.burst, self.tokens + (now - self.timestamp) * self.rate)
+                self.timestamp = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait: float = (1 - self.tokens) / self.rate
+
+            sleep(wait)
+
+
+@dataclass
+class DownloadTask:
+    """
+    Single request to be sent to datafeed.
+    """
+
+    market: Market
+    method: str
+    args: tuple
+    key: str = ""
+
+    result: Any = field(default=None, init=False)
+    error: str = field(default="", init=False)
+
+
+class DatafeedProvider:
+    """
+    Concurrency and rate limit of one datafeed object.
+    """
+
+    def __init__(self, datafeed: BaseDatafeed, max_workers: int, rate: float) -> None:
+        """"""
+        self.datafeed: BaseDatafeed = datafeed
+        self.max_workers: int = max_workers
+        self.limiter: RateLimiter = RateLimiter(rate)
+        self.executor: ThreadPoolExecutor = None
+
+
+class HistoryDownloader:
+    """
+    Download orchestrator for a universe of symbols.
+
+    Requests are run in parallel per datafeed with its own concurrency and
+    rate limit, retried with exponential backoff, and results are handed to
+    database recorder or callback as soon as they complete.
+    """
+
+    def __init__(
+        self,
+        datafeeds: Dict[Market, BaseDatafeed] = None,
+        max_workers: int = 4,
+        rate: float = 10,
+        max_retry: int = 3,
+        backoff: float = 1.0,
+        recorder: DatabaseRecorder = None,
+        output: Callable = print
+    ) -> None:
+        """"""
+        self.datafeeds: Dict[Market, BaseDatafeed] = datafeeds or get_datafeeds()
+        self.max_retry: int = max_retry
+        self.backoff: float = backoff
+        self.recorder: DatabaseRecorder = recorder
+        self.output: Callable = output
+
+        # Markets sharing the same datafeed object share one provider
+        self.providers: Dict[int, DatafeedProvider] = {}
+        for datafeed in self.datafeeds.values():
+            if id(datafeed) not in self.providers:
+                self.providers[id(datafeed)] = DatafeedProvider(datafeed, max_workers, rate)
+
+    def set_limit(self, market: Market, max_workers: int, rate: float) -> None:
+        """
+        Set concurrency and rate limit of datafeed used by market.
+        """
+        provider: DatafeedProvider = self.get_provider(market)
+        provider.max_workers = max_workers
+        provider.limiter = RateLimiter(rate)
+
+    def get_provider(self, market: Market) -> DatafeedProvider:
+        """"""
+        return self.providers[id(self.datafeeds[market])]
+
+    def download_bar_data(
+        self,
+        vt_symbols: List[str],
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        index: bool = False,
+        callback: Callable[[DownloadTask], None] = None
+    ) -> List[DownloadTask]:
+        """
+        Download bar data of symbols, save into database by recorder if given.
+        """
+        method: str = "query_index_bar_history" if index else "query_bar_history"
+
+        tasks: List[DownloadTask] = []
+        for vt_symbol in vt_symbols:
+            symbol, exchange = extract_vt_symbol(vt_symbol)
+
+            req: HistoryRequest = HistoryRequest(
+                symbol=symbol,
+                exchange=exchange,
+                start=start,
+                end=end,
+                interval=interval
+            )
+            task: DownloadTask = DownloadTask(exchange_to_market(exchange), method, (req,), vt_symbol)
+            tasks.append(task)
+
+        def process_bars(task: DownloadTask) -> None:
+            if self.recorder and task.result:
+                bars: List[BarData] = task.result
+                for bar in bars:
+                    self.recorder.update_bar(bar)
+
+            if callback:
+                callback(task)
+
+        return self.run_tasks(tasks, process_bars)
+
+    def download_shares(
+        self,
+        vt_symbols: List[str],
+        start: datetime,
+        end: datetime,
+        batch_size: int = 100,
+        callback: Callable[[DownloadTask], None] = None
+    ) -> List[DownloadTask]:
+        """
+        Download shares data of symbols in batches.
+        """
+        tasks: List[DownloadTask] = self.create_batch_tasks(
+            "get_shares", vt_symbols, batch_size, (start, end)
+        )
+        return self.run_tasks(tasks, callback)
+
+    def download_ex_factor(
+        self,
+        vt_symbols: List[str],
+        batch_size: int = 100,
+        callback: Callable[[DownloadTask], None] = None
+    ) -> List[DownloadTask]:
+        """
+        Download ex factor of symbols in batches.
+        """
+        tasks: List[DownloadTask] = self.create_batch_tasks(
+            "get_ex_factor", vt_symbols, batch_size, ()
+        )
+        return self.run_tasks(tasks, callback)
+
+    def create_batch_tasks(
+        self,
+        method: str,
+        vt_symbols: List[str],
+        batch_size: int,
+        args: tuple
+    ) -> List[DownloadTask]:
+        """
+        Split symbols of each market into batches of one request.
+        """
+        groups: Dict[Market, List[str]] = {}
+        for vt_symbol in vt_symbols:
+            _, exchange = extract_vt_symbol(vt_symbol)
+            groups.setdefault(exchange_to_market(exchange), []).append(vt_symbol)
+
+        tasks: List[DownloadTask] = []
+        for market, symbols in groups.items():
+            for i in range(0, len(symbols), batch_size):
+                batch: List[str] = symbols[i: i + batch_size]
+                task: DownloadTask = DownloadTask(market, method, (batch, *args), batch[0])
+                tasks.append(task)
+
+        return tasks
+
+    def run_tasks(
+        self,
+        tasks: List[DownloadTask],
+        callback: Callable[[DownloadTask], None] = None
+    ) -> List[DownloadTask]:
+        """
+        Run tasks on executor of each provider, callback on completion.
+        """
+        for provider in self.providers.values():
+            provider.executor = ThreadPoolExecutor(provider.max_workers)
+
+        try:
+            futures: Dict[Future, DownloadTask] = {}
+            for task in tasks:
+                provider: DatafeedProvider = self.get_provider(task.market)
+                future: Future = provider.executor.submit(self.run_task, provider, task)
+                futures[future] = task
+
+            finished: int = 0
+            failed: int = 0
+
+            for future in as_completed(futures):
+                task: DownloadTask = futures[future]
+                finished += 1
+
+                if task.error:
+                    failed += 1
+                    self.output(f"{task.key} {task.method}下载失败：{task.error}")
+                elif callback:
+                    callback(task)
+
+            self.output(f"下载任务完成，总数{finished}，失败{failed}")
+        finally:
+            for provider in self.providers.values():
+                provider.executor.shutdown()
+                provider.executor = None
+
+        return tasks
+
+    def run_task(self, provider: DatafeedProvider, task: DownloadTask) -> None:
+        """
+        Call datafeed with rate limit and retry.
+        """
+        func: Callable = getattr(provider.datafeed, task.method)
+
+        for n in range(self.max_retry + 1):
+            provider.limiter.acquire()
+
+            try:
+                result: Optional[Any] = func(*task.args, output=self.output)
+            except Exception as e:      # noqa
+                task.error = str(e)
+            else:
+                if result is not None:
+                    task.result = result
+                    task.error = ""
+                    return
+                task.error = "数据服务返回空结果"
+
+            if n < self.max_retry:
+                sleep(self.backoff * 2 ** n * (1 + random()))
+
+
+def create_history_recorder() -> DatabaseRecorder:
+    """
+    Create recorder for saving downloaded history data into database.
+    """
+    return DatabaseRecorder(stream=False, conflict=Conflict.IGNORE, batch_size=10000)
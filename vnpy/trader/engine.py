@@ -2,10 +2,12 @@ import logging
 from logging import Logger
 import smtplib
 import os
+import sys
 from abc import ABC
 from pathlib import Path
 from datetime import datetime
 from email.message import EmailMessage
+from types import ModuleType
 from queue import Empty, Queue
 from threading import Thread
 from typing import Any, Type, Dict, List, Optional
@@ -236,6 +238,12 @@ class MainEngine:
         for engine in self.engines.values():
             engine.close()
 
+        # Flush data queued in database recorders, only if database module
+        # has been loaded, so that programs not using it are not affected.
+        module: ModuleType = sys.modules.get(f"{__package__}.database", None)
+        if module:
+            module.close_recorders()
+
         for gateway in self.gateways.values():
             gateway.close()
 
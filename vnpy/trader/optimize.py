@@ -1,26 +1,141 @@
-from typing import Dict, List, Callable, Tuple
-from itertools import product
-from concurrent.futures import ProcessPoolExecutor
-from random import random, choice
-from time import perf_counter
-from multiprocessing import get_context
+from typing import Dict, List, Callable, Tuple, Iterator, Set, Optional, ContextManager, Union
+from contextlib import nullcontext
+from pathlib import Path
+import pickle
+import re
+from hashlib import sha1
+from itertools import product, islice
+from concurrent.futures import ProcessPoolExecutor, Executor, Future, wait, FIRST_COMPLETED
+from functools import partial
+from math import prod, erf, sqrt, pi
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from os import cpu_count, getpid
+from socket import gethostname
+from random import random, randrange, sample, getstate, setstate
+from time import perf_counter, sleep
+from multiprocessing import get_context, get_all_start_methods
 from multiprocessing.context import BaseContext
-from _collections_abc import dict_keys, dict_values, Iterable
+from _collections_abc import Iterable
 
+import numpy as np
 from tqdm import tqdm
 from deap import creator, base, tools, algorithms
 
+from .utility import get_folder_path
+
 
 OUTPUT_FUNC = Callable[[str], None]
 EVALUATE_FUNC = Callable[[dict], dict]
 KEY_FUNC = Callable[[list], float]
 
 
+# Memory address in repr of objects, removed from fingerprint
+ADDRESS_PATTERN: re.Pattern = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+# Shared data loaded once in each worker process
+worker_data: Dict[str, np.ndarray] = {}
+
+
 # Create individual class used in genetic algorithm optimization
 creator.create("FitnessMax", base.Fitness, weights=(1.0,))
 creator.create("Individual", list, fitness=creator.FitnessMax)
 
 
+def get_individual_class(weights: Tuple[float, ...]) -> type:
+    """
+    Get individual class with fitness of weights, created on first use.
+    """
+    if weights == (1.0,):
+        return creator.Individual
+
+    suffix: str = "_".join(str(w).replace("-", "n").replace(".", "p") for w in weights)
+    fitness_name: str = f"Fitness_{suffix}"
+    individual_name: str = f"Individual_{suffix}"
+
+    if not hasattr(creator, individual_name):
+        creator.create(fitness_name, base.Fitness, weights=weights)
+        creator.create(individual_name, list, fitness=getattr(creator, fitness_name))
+
+    return getattr(creator, individual_name)
+
+
+class ParameterSpace:
+    """
+    Lazy cartesian product of parameter values.
+
+    Settings are decoded from index on demand, in the same order as
+    itertools.product, so that huge spaces never need to be materialized.
+    """
+
+    def __init__(self, params: Dict[str, List]) -> None:
+        """"""
+        self.keys: List[str] = list(params.keys())
+        self.values: List[List] = [list(v) for v in params.values()]
+        self.size: int = prod(len(v) for v in self.values)
+
+    def __len__(self) -> int:
+        """"""
+        return self.size
+
+    def __getitem__(self, index: int) -> dict:
+        """
+        Decode index into setting, with last parameter changing fastest.
+        """
+        positions: List[int] = self.get_positions(index)
+        return {key: values[i] for key, values, i in zip(self.keys, self.values, positions)}
+
+    def get_positions(self, index: int) -> List[int]:
+        """
+        Decode index into position in value list of each parameter.
+        """
+        if index < 0:
+            index += self.size
+
+        if not 0 <= index < self.size:
+            raise IndexError("参数组合索引超出范围")
+
+        positions: List[int] = []
+        for values in reversed(self.values):
+            index, i = divmod(index, len(values))
+            positions.append(i)
+
+        positions.reverse()
+        return positions
+
+    def get_coordinates(self, indexes: List[int]) -> np.ndarray:
+        """
+        Get coordinates of settings normalized into [0, 1] on each parameter.
+        """
+        scales: np.ndarray = np.array([max(len(values) - 1, 1) for values in self.values], dtype=float)
+        positions: np.ndarray = np.array([self.get_positions(index) for index in indexes], dtype=float)
+        return positions.reshape(len(indexes), len(self.values)) / scales
+
+    def __iter__(self) -> Iterator[dict]:
+        """"""
+        for p in product(*self.values):
+            yield dict(zip(self.keys, p))
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[List[dict]]:
+        """
+        Iterate settings in lists of chunk size.
+        """
+        return iter_chunks(self, chunk_size)
+
+
+def iter_chunks(iterable: Iterable, chunk_size: int) -> Iterator[list]:
+    """
+    Iterate items of iterable in lists of chunk size.
+    """
+    it: Iterator = iter(iterable)
+    while True:
+        chunk: list = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class OptimizationSetting:
     """
     Setting for runnning optimization.
@@ -30,6 +145,7 @@ class OptimizationSetting:
         """"""
         self.params: Dict[str, List] = {}
         self.target_name: str = ""
+        self.targets: Dict[str, float] = {}
 
     def add_parameter_values(self, name: str, values: list) -> Tuple[bool, str]:
         """"""
@@ -72,18 +188,29 @@ class OptimizationSetting:
         """"""
         self.target_name = target_name
 
-    def generate_settings(self) -> List[dict]:
-        """"""
-        keys: dict_keys = self.params.keys()
-        values: dict_values = self.params.values()
-        products: list = list(product(*values))
+    def add_target(self, target_name: str, weight: float = 1.0) -> None:
+        """
+        Add target of multi-objective optimization, negative weight to minimize.
+        """
+        self.targets[target_name] = weight
 
-        settings: list = []
-        for p in products:
-            setting: dict = dict(zip(keys, p))
-            settings.append(setting)
+    def get_weights(self) -> Tuple[float, ...]:
+        """
+        Get weights of targets, single maximized target if not added.
+        """
+        if not self.targets:
+            return (1.0,)
+        return tuple(self.targets.values())
+
+    def get_space(self) -> ParameterSpace:
+        """
+        Get lazy parameter space of settings.
+        """
+        return ParameterSpace(self.params)
 
-        return settings
+    def generate_settings(self) -> List[dict]:
+        """"""
+        return list(self.get_space())
 
 
 def check_optimization_setting(
@@ -91,41 +218,402 @@ def check_optimization_setting(
     output: OUTPUT_FUNC = print
 ) -> bool:
     """"""
-    if not optimization_setting.generate_settings():
+    if not len(optimization_setting.get_space()):
         output("优化参数组合为空，请检查")
         return False
 
-    if not optimization_setting.target_name:
+    if not optimization_setting.target_name and not optimization_setting.targets:
         output("优化目标未设置，请检查")
         return False
 
     return True
 
 
+def dump_worker_data(name: str, data: Dict[str, np.ndarray]) -> Path:
+    """
+    Save arrays into npy files in trader dir for preloading by workers.
+    """
+    folder_path: Path = get_folder_path("optimize").joinpath(name)
+    folder_path.mkdir(exist_ok=True)
+
+    for key, array in data.items():
+        np.save(folder_path.joinpath(f"{key}.npy"), np.asarray(array))
+
+    return folder_path
+
+
+def load_worker_data(folder_path: Path) -> None:
+    """
+    Worker initializer memory-mapping arrays saved by dump_worker_data.
+
+    Pages of mapped files are shared by all workers through OS page cache.
+    """
+    worker_data.clear()
+
+    for file_path in Path(folder_path).glob("*.npy"):
+        worker_data[file_path.stem] = np.load(file_path, mmap_mode="r")
+
+
+def get_worker_data() -> Dict[str, np.ndarray]:
+    """
+    Get shared data preloaded in current worker process.
+    """
+    return worker_data
+
+
+def get_executor(
+    executor: Optional[Executor],
+    max_workers: int,
+    initializer: Callable,
+    initargs: tuple
+) -> ContextManager[Executor]:
+    """
+    Get context of executor given, or of new local process pool.
+    """
+    if executor:
+        return nullcontext(executor)
+
+    return ProcessPoolExecutor(
+        max_workers,
+        mp_context=get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs
+    )
+
+
+def warm_up_worker(duration: float) -> int:
+    """
+    Task keeping worker busy, so that all workers are started.
+    """
+    sleep(duration)
+    return getpid()
+
+
+class WorkerPool:
+    """
+    Persistent process pool reused across optimization runs.
+
+    Workers are forked from forkserver with modules preloaded, so that
+    heavy imports are done only once in forkserver process. Spawn is used
+    instead on platforms without forkserver. Pool should be shut down
+    explicitly when no longer needed.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        preload: List[str] = None,
+        initializer: Callable = None,
+        initargs: tuple = (),
+        output: OUTPUT_FUNC = print
+    ) -> None:
+        """"""
+        self.max_workers: int = max_workers or cpu_count()
+        self.preload: List[str] = ["vnpy.trader.optimize"] + (preload or [])
+        self.initializer: Callable = initializer
+        self.initargs: tuple = initargs
+        self.output: OUTPUT_FUNC = output
+
+        self.executor: ProcessPoolExecutor = None
+        self.startup_cost: float = 0
+
+    def start(self) -> None:
+        """
+        Start all workers and measure startup cost.
+        """
+        if self.executor:
+            return
+
+        if "forkserver" in get_all_start_methods():
+            context: BaseContext = get_context("forkserver")
+            # Preload only takes effect before forkserver process started
+            context.set_forkserver_preload(self.preload)
+        else:
+            context: BaseContext = get_context("spawn")
+
+        start: float = perf_counter()
+
+        self.executor = ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=context,
+            initializer=self.initializer,
+            initargs=self.initargs
+        )
+
+        pids: Set[int] = set(self.executor.map(warm_up_worker, [0.1] * self.max_workers))
+
+        self.startup_cost = perf_counter() - start
+        self.output(
+            f"工作进程池启动完成，启动方式{context.get_start_method()}，"
+            f"进程数{len(pids)}，耗时{self.startup_cost:.2f}秒"
+        )
+
+    def get_executor(self) -> Executor:
+        """
+        Get executor of pool, start workers if not started.
+        """
+        self.start()
+        return self.executor
+
+    def shutdown(self) -> None:
+        """"""
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> "WorkerPool":
+        """"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """"""
+        self.shutdown()
+
+
+def evaluate_chunk(evaluate_func: EVALUATE_FUNC, settings: List[dict]) -> List[Tuple]:
+    """
+    Evaluate settings of one chunk in worker process.
+    """
+    return [evaluate_func(setting) for setting in settings]
+
+
+def evaluate_timed(func: Callable, item: object) -> Tuple[object, str, float]:
+    """
+    Run function in worker, return result with worker id and time cost.
+    """
+    start: float = perf_counter()
+    result: object = func(item)
+    cost: float = perf_counter() - start
+    return result, f"{gethostname()}_{getpid()}", cost
+
+
+def evaluate_indexed(evaluate_func: EVALUATE_FUNC, item: Tuple[int, dict]) -> Tuple:
+    """"""
+    return evaluate_func(item[1])
+
+
+@dataclass
+class OptimizationProgress:
+    """
+    Snapshot of optimization progress and throughput.
+
+    Overhead time is round trip time of tasks minus time spent in evaluate
+    function, which includes pickling, IPC and waiting in executor queue.
+    """
+
+    total: int
+    finished: int
+    cache_hits: int
+    backlog: int
+    elapsed: float
+    evaluations_per_second: float
+    eta: float
+    evaluate_time: float
+    overhead_time: float
+    worker_busy: Dict[str, float] = field(default_factory=dict)
+
+
+class ProgressTracker:
+    """
+    Collect metrics of evaluations and report progress periodically.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        progress_func: Callable[[OptimizationProgress], None],
+        interval: float = 1.0
+    ) -> None:
+        """"""
+        self.total: int = total
+        self.progress_func: Callable[[OptimizationProgress], None] = progress_func
+        self.interval: float = interval
+
+        self.finished: int = 0
+        self.evaluated: int = 0
+        self.cache_hits: int = 0
+        self.submitted: int = 0
+        self.completed: int = 0
+
+        self.evaluate_time: float = 0
+        self.roundtrip_time: float = 0
+        self.worker_busy: Dict[str, float] = {}
+
+        self.start: float = perf_counter()
+        self.report_time: float = 0
+
+    def on_submit(self) -> None:
+        """"""
+        self.submitted += 1
+
+    def on_result(self, worker_id: str, cost: float, roundtrip: float, count: int) -> None:
+        """
+        Record task finished with count of evaluations.
+        """
+        self.completed += 1
+        self.finished += count
+        self.evaluated += count
+
+        self.evaluate_time += cost
+        self.roundtrip_time += roundtrip
+        self.worker_busy[worker_id] = self.worker_busy.get(worker_id, 0) + cost
+
+        self.report()
+
+    def on_skip(self, count: int) -> None:
+        """
+        Record settings finished before, e.g. loaded from checkpoint.
+        """
+        self.finished += count
+
+    def on_cache_hit(self, count: int) -> None:
+        """"""
+        self.finished += count
+        self.cache_hits += count
+
+    def get_progress(self) -> OptimizationProgress:
+        """"""
+        elapsed: float = perf_counter() - self.start
+        rate: float = self.evaluated / elapsed if elapsed else 0
+
+        remaining: int = max(self.total - self.finished, 0)
+        eta: float = remaining / rate if rate else 0
+
+        return OptimizationProgress(
+            total=self.total,
+            finished=self.finished,
+            cache_hits=self.cache_hits,
+            backlog=self.submitted - self.completed,
+            elapsed=elapsed,
+            evaluations_per_second=rate,
+            eta=eta,
+            evaluate_time=self.evaluate_time,
+            overhead_time=max(self.roundtrip_time - self.evaluate_time, 0),
+            worker_busy=dict(self.worker_busy)
+        )
+
+    def report(self, force: bool = False) -> None:
+        """
+        Call progress function, at most once per interval unless forced.
+        """
+        now: float = perf_counter()
+        if not force and now - self.report_time < self.interval:
+            return
+
+        self.report_time = now
+        self.progress_func(self.get_progress())
+
+
+def create_tracker(
+    total: int,
+    progress_func: Optional[Callable[[OptimizationProgress], None]],
+    interval: float
+) -> Optional[ProgressTracker]:
+    """"""
+    if not progress_func:
+        return None
+    return ProgressTracker(total, progress_func, interval)
+
+
 def run_bf_optimization(
     evaluate_func: EVALUATE_FUNC,
     optimization_setting: OptimizationSetting,
     key_func: KEY_FUNC,
     max_workers: int = None,
-    output: OUTPUT_FUNC = print
+    output: OUTPUT_FUNC = print,
+    chunk_size: int = 1,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    checkpoint_name: str = "",
+    checkpoint_interval: float = 60,
+    run_key: str = "",
+    callback: Callable[[Tuple], None] = None,
+    executor: Executor = None,
+    progress_func: Callable[[OptimizationProgress], None] = None,
+    progress_interval: float = 1.0
 ) -> List[Tuple]:
-    """Run brutal force optimization"""
-    settings: List[Dict] = optimization_setting.generate_settings()
+    """
+    Run brutal force optimization.
+
+    Settings are sent to workers in chunks of chunk_size, and initializer
+    is run once in each worker, e.g. load_worker_data for preloading bar
+    data shared by all evaluations.
+
+    With checkpoint_name given, finished results are saved into trader dir
+    every checkpoint_interval seconds, and settings already finished are
+    skipped when run again. Checkpoint is only reused if evaluate function,
+    parameter space, targets and run_key (e.g. strategy class and backtest
+    range) are unchanged. Callback is called with each new result.
+
+    Executor given, e.g. OptimizationCoordinator, is used instead of local
+    process pool and not shut down after optimization.
+
+    Progress func is called with OptimizationProgress every progress
+    interval seconds, from the thread running optimization.
+    """
+    space: ParameterSpace = optimization_setting.get_space()
 
     output("开始执行穷举算法优化")
-    output(f"参数优化空间：{len(settings)}")
+    output(f"参数优化空间：{len(space)}")
+
+    fingerprint: str = get_fingerprint(evaluate_func, optimization_setting, run_key)
+    finished: Dict[Tuple, Tuple] = load_checkpoint(checkpoint_name, fingerprint, output)
+    if finished:
+        output(f"从检查点恢复，已完成{len(finished)}")
 
     start: int = perf_counter()
+    save_time: float = start
+
+    tracker: ProgressTracker = create_tracker(len(space), progress_func, progress_interval)
+
+    with get_executor(executor, max_workers, initializer, initargs) as executor:
+        results: List[Tuple] = []
+        progress: tqdm = tqdm(total=len(space))
+
+        def iter_pending() -> Iterator[dict]:
+            """
+            Iterate settings not finished yet.
+            """
+            for setting in space:
+                result: Tuple = finished.get(tuple(setting.items()), None)
+                if result is None:
+                    yield setting
+                else:
+                    results.append(result)
+                    progress.update(1)
+
+                    if tracker:
+                        tracker.on_skip(1)
+
+        # Keep limited chunks in flight, so that settings are generated lazily
+        max_pending: int = (max_workers or cpu_count()) * 4
+        chunk_func: Callable = partial(evaluate_chunk, evaluate_func)
+        chunks: Iterator[List[dict]] = iter_chunks(iter_pending(), chunk_size)
+
+        try:
+            with progress:
+                for settings, chunk_results in imap_unordered(executor, chunk_func, chunks, max_pending, tracker):
+                    for setting, result in zip(settings, chunk_results):
+                        finished[tuple(setting.items())] = result
+                        results.append(result)
+
+                        if callback:
+                            callback(result)
+
+                    progress.update(len(chunk_results))
+
+                    if checkpoint_name and perf_counter() - save_time >= checkpoint_interval:
+                        save_checkpoint(checkpoint_name, finished, fingerprint)
+                        save_time = perf_counter()
+        finally:
+            # Save finished results even if interrupted by error
+            if checkpoint_name:
+                save_checkpoint(checkpoint_name, finished, fingerprint)
+
+        if tracker:
+            tracker.report(force=True)
 
-    with ProcessPoolExecutor(
-        max_workers,
-        mp_context=get_context("spawn")
-    ) as executor:
-        it: Iterable = tqdm(
-            executor.map(evaluate_func, settings),
-            total=len(settings)
-        )
-        results: List[Tuple] = list(it)
         results.sort(reverse=True, key=key_func)
 
         end: int = perf_counter()
@@ -135,6 +623,53 @@ def run_bf_optimization(
         return results
 
 
+def imap_unordered(
+    executor: Executor,
+    func: Callable,
+    iterable: Iterable,
+    max_pending: int,
+    tracker: ProgressTracker = None
+) -> Iterator[Tuple]:
+    """
+    Map function over iterable on executor with bounded tasks in flight,
+    yield item and result pairs in completion order.
+
+    With tracker given, time cost of each task is measured in worker, and
+    list item is counted as chunk of evaluations.
+    """
+    if tracker:
+        func = partial(evaluate_timed, func)
+
+    it: Iterator = iter(iterable)
+    pending: Dict[Future, Tuple[object, float]] = {}
+
+    def submit(item: object) -> None:
+        """"""
+        pending[executor.submit(func, item)] = (item, perf_counter())
+        if tracker:
+            tracker.on_submit()
+
+    for item in islice(it, max_pending):
+        submit(item)
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            item, submit_time = pending.pop(future)
+            result: object = future.result()
+
+            if tracker:
+                result, worker_id, cost = result
+                count: int = len(item) if isinstance(item, list) else 1
+                tracker.on_result(worker_id, cost, perf_counter() - submit_time, count)
+
+            yield item, result
+
+        for item in islice(it, len(done)):
+            submit(item)
+
+
 def run_ga_optimization(
     evaluate_func: EVALUATE_FUNC,
     optimization_setting: OptimizationSetting,
@@ -142,16 +677,48 @@ def run_ga_optimization(
     max_workers: int = None,
     population_size: int = 100,
     ngen_size: int = 30,
-    output: OUTPUT_FUNC = print
+    output: OUTPUT_FUNC = print,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    cache_name: str = "",
+    checkpoint_name: str = "",
+    run_key: str = "",
+    callback: Callable[[Tuple], None] = None,
+    executor: Executor = None,
+    progress_func: Callable[[OptimizationProgress], None] = None,
+    progress_interval: float = 1.0
 ) -> List[Tuple]:
-    """Run genetic algorithm optimization"""
+    """
+    Run genetic algorithm optimization.
+
+    Individuals of each generation are deduplicated in parent process, and
+    only settings not evaluated before are sent to workers. With cache_name
+    given, results are also persisted into trader dir, so that rerun of the
+    same search reuses them.
+
+    With checkpoint_name given, population, results and random state are
+    saved into trader dir after each generation, and an interrupted run
+    resumes from the last finished generation. Cache and checkpoint are
+    only reused if evaluate function, parameter space, targets and run_key
+    (e.g. strategy class and backtest range) are unchanged. Callback is
+    called with each new result.
+
+    Executor given is used instead of local process pool, and progress func
+    is called with OptimizationProgress periodically.
+
+    With multiple targets added into optimization setting, key_func should
+    return values of targets in the same order, and Pareto front of all
+    results evaluated is returned.
+    """
     # Define functions for generate parameter randomly
-    buf: List[Dict] = optimization_setting.generate_settings()
-    settings: List[Tuple] = [list(d.items()) for d in buf]
+    space: ParameterSpace = optimization_setting.get_space()
+
+    weights: Tuple[float, ...] = optimization_setting.get_weights()
+    individual_class: type = get_individual_class(weights)
 
     def generate_parameter() -> list:
         """"""
-        return choice(settings)
+        return list(space[randrange(len(space))].items())
 
     def mutate_individual(individual: list, indpb: float) -> tuple:
         """"""
@@ -162,29 +729,50 @@ def run_ga_optimization(
                 individual[i] = paramlist[i]
         return individual,
 
-    # Set up multiprocessing Pool and Manager
-    ctx: BaseContext = get_context("spawn")
-    with ctx.Manager() as manager, ctx.Pool(max_workers) as pool:
-        # Create shared dict for result cache
-        cache: Dict[Tuple, Tuple] = manager.dict()
+    # Result cache in parent process, keyed by parameter tuple
+    fingerprint: str = get_fingerprint(evaluate_func, optimization_setting, run_key)
+    cache: Dict[Tuple, Tuple] = load_checkpoint(cache_name, fingerprint, output)
+    keys: Set[Tuple] = set()
+    hit_count: int = 0
+    tracker: ProgressTracker = None
+
+    # Set up executor
+    with get_executor(executor, max_workers, initializer, initargs) as executor:
+        def map_population(func: EVALUATE_FUNC, population: list) -> List[Tuple]:
+            """
+            Evaluate only unseen settings of population in worker pool.
+            """
+            nonlocal hit_count
+
+            population_keys: List[Tuple] = [tuple(individual) for individual in population]
+            keys.update(population_keys)
+
+            unseen: List[Tuple] = [k for k in dict.fromkeys(population_keys) if k not in cache]
+            hit_count += len(population_keys) - len(unseen)
+
+            if tracker:
+                tracker.on_cache_hit(len(population_keys) - len(unseen))
+
+            if unseen:
+                results: List[Tuple] = evaluate_settings(executor, func, [dict(k) for k in unseen], callback, tracker)
+                cache.update(zip(unseen, results))
+
+                if cache_name:
+                    save_checkpoint(cache_name, cache, fingerprint)
+
+            return [to_fitness(key_func(cache[k])) for k in population_keys]
 
         # Set up toolbox
         toolbox: base.Toolbox = base.Toolbox()
-        toolbox.register("individual", tools.initIterate, creator.Individual, generate_parameter)
+        toolbox.register("individual", tools.initIterate, individual_class, generate_parameter)
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
         toolbox.register("mate", tools.cxTwoPoint)
         toolbox.register("mutate", mutate_individual, indpb=1)
         toolbox.register("select", tools.selNSGA2)
-        toolbox.register("map", pool.map)
-        toolbox.register(
-            "evaluate",
-            ga_evaluate,
-            cache,
-            evaluate_func,
-            key_func
-        )
+        toolbox.register("map", map_population)
+        toolbox.register("evaluate", evaluate_func)
 
-        total_size: int = len(settings)
+        total_size: int = len(space)
         pop_size: int = population_size                      # number of individuals in each generation
         lambda_: int = pop_size                              # number of children to produce at each generation
         mu: int = int(pop_size * 0.8)                        # number of individuals to select for the next generation
@@ -193,8 +781,6 @@ def run_ga_optimization(
         mutpb: float = 1 - cxpb    # probability that an offspring is produced by mutation
         ngen: int = ngen_size    # number of generation
 
-        pop: list = toolbox.population(pop_size)
-
         # Run ga optimization
         output("开始执行遗传算法优化")
         output(f"参数优化空间：{total_size}")
@@ -206,43 +792,648 @@ def run_ga_optimization(
 
         start: int = perf_counter()
 
-        algorithms.eaMuPlusLambda(
-            pop,
-            toolbox,
-            mu,
-            lambda_,
-            cxpb,
-            mutpb,
-            ngen,
-            verbose=True
+        # Generation state also depends on population and generation size
+        ga_fingerprint: str = get_fingerprint(
+            evaluate_func, optimization_setting, run_key, population_size, ngen_size
         )
+        checkpoint: dict = load_checkpoint(checkpoint_name, ga_fingerprint, output)
+        if checkpoint:
+            pop: list = [individual_class(p) for p in checkpoint["population"]]
+            for individual, values in zip(pop, checkpoint["fitness"]):
+                individual.fitness.values = values
+
+            cache.update(checkpoint["cache"])
+            keys.update(checkpoint["keys"])
+            setstate(checkpoint["random_state"])
+
+            start_gen: int = checkpoint["generation"]
+            output(f"从检查点恢复，已完成{start_gen}代")
+        else:
+            pop: list = toolbox.population(pop_size)
+            start_gen: int = 0
+
+        total: int = sum(pop_size if gen == 0 else lambda_ for gen in range(start_gen, ngen + 1))
+        tracker = create_tracker(total, progress_func, progress_interval)
+
+        # Run one generation each time, so that state can be saved in between
+        for gen in range(start_gen, ngen + 1):
+            _, logbook = algorithms.eaMuPlusLambda(
+                pop,
+                toolbox,
+                mu,
+                lambda_,
+                cxpb,
+                mutpb,
+                1 if gen else 0,
+                verbose=False
+            )
+            output(f"第{gen}代完成，评估个体{logbook[-1]['nevals']}")
+
+            if checkpoint_name:
+                checkpoint = {
+                    "generation": gen + 1,
+                    "population": [list(individual) for individual in pop],
+                    "fitness": [individual.fitness.values for individual in pop],
+                    "cache": cache,
+                    "keys": keys,
+                    "random_state": getstate()
+                }
+                save_checkpoint(checkpoint_name, checkpoint, ga_fingerprint)
+
+        if tracker:
+            tracker.report(force=True)
 
         end: int = perf_counter()
         cost: int = int((end - start))
 
-        output(f"遗传算法优化完成，耗时{cost}秒")
+        output(f"遗传算法优化完成，耗时{cost}秒，参数组合{len(keys)}个，缓存命中{hit_count}次")
+
+        results: list = [cache[k] for k in keys]
+
+        if len(weights) > 1:
+            results = get_pareto_front(results, key_func, weights)
+            output(f"帕累托前沿参数组合{len(results)}个")
+        else:
+            results.sort(reverse=True, key=key_func)
 
-        results: list = list(cache.values())
-        results.sort(reverse=True, key=key_func)
         return results
 
 
-def ga_evaluate(
-    cache: dict,
-    evaluate_func: callable,
-    key_func: callable,
-    parameters: list
-) -> float:
+def to_fitness(value: Union[float, Iterable]) -> Tuple[float, ...]:
+    """
+    Convert value returned by key_func into fitness values.
+    """
+    if isinstance(value, (tuple, list)):
+        return tuple(value)
+    return (value,)
+
+
+def get_pareto_front(
+    results: List[Tuple],
+    key_func: KEY_FUNC,
+    weights: Tuple[float, ...]
+) -> List[Tuple]:
+    """
+    Get results not dominated by any other result on targets.
+
+    Targets with negative weight are minimized. Front returned is sorted
+    by the first target from best to worst.
+    """
+    if not results:
+        return []
+
+    signs: np.ndarray = np.sign(np.array(weights, dtype=float))
+    values: np.ndarray = np.array([to_fitness(key_func(r)) for r in results], dtype=float) * signs
+
+    dominated: np.ndarray = np.zeros(len(results), dtype=bool)
+
+    for i in range(len(values)):
+        if dominated[i]:
+            continue
+
+        better_equal: np.ndarray = (values >= values[i]).all(axis=1)
+        better: np.ndarray = (values > values[i]).any(axis=1)
+        if (better_equal & better).any():
+            dominated[i] = True
+
+    front: List[int] = sorted(np.flatnonzero(~dominated), key=lambda i: values[i][0], reverse=True)
+    return [results[i] for i in front]
+
+
+class StatisticsKey:
+    """
+    Picklable key_func getting values of targets from statistics in result.
+    """
+
+    def __init__(self, names: List[str]) -> None:
+        """"""
+        self.names: List[str] = names
+
+    def __call__(self, result: Tuple) -> Tuple[float, ...]:
+        """"""
+        statistics: dict = result[-1]
+        return tuple(statistics[name] for name in self.names)
+
+
+def evaluate_settings(
+    executor: Executor,
+    evaluate_func: EVALUATE_FUNC,
+    settings: List[dict],
+    callback: Callable[[Tuple], None] = None,
+    tracker: ProgressTracker = None
+) -> List[Tuple]:
+    """
+    Evaluate settings in parallel on executor, return results in order.
+    """
+    results: List[Tuple] = [None] * len(settings)
+    func: Callable = partial(evaluate_indexed, evaluate_func)
+
+    for (i, _), result in imap_unordered(executor, func, enumerate(settings), len(settings), tracker):
+        results[i] = result
+
+        if callback:
+            callback(result)
+
+    return results
+
+
+def run_sh_optimization(
+    evaluate_func: EVALUATE_FUNC,
+    optimization_setting: OptimizationSetting,
+    key_func: KEY_FUNC,
+    max_workers: int = None,
+    sample_size: int = 81,
+    eta: int = 3,
+    min_budget: float = 1 / 9,
+    budget_key: str = "budget",
+    output: OUTPUT_FUNC = print,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    callback: Callable[[Tuple], None] = None,
+    executor: Executor = None,
+    progress_func: Callable[[OptimizationProgress], None] = None,
+    progress_interval: float = 1.0
+) -> List[Tuple]:
+    """
+    Run successive halving optimization.
+
+    Randomly sampled settings are evaluated with a small budget first, and
+    only the best 1/eta of them go on to next round with eta times budget,
+    until full budget of 1. Budget is passed to evaluate_func in setting
+    with budget_key, e.g. as fraction of backtesting data window used.
+
+    Results of settings evaluated with full budget are returned, and only
+    these results are passed to callback, since scores of partial budgets
+    are not comparable with them.
+    """
+    space: ParameterSpace = optimization_setting.get_space()
+
+    size: int = min(sample_size, len(space))
+    candidates: List[dict] = [space[i] for i in sample(range(len(space)), size)]
+
+    output("开始执行连续减半算法优化")
+    output(f"参数优化空间：{len(space)}")
+    output(f"初始采样个数：{size}")
+
+    # Budget of each round, with float error of the last one avoided
+    budgets: List[float] = []
+    budget: float = min_budget
+    while budget < 1 - 1e-9:
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(1)
+
+    total: int = sum(max(size // eta ** n, 1) for n in range(len(budgets)))
+    tracker: ProgressTracker = create_tracker(total, progress_func, progress_interval)
+
+    start: int = perf_counter()
+    evaluate_count: int = 0
+
+    with get_executor(executor, max_workers, initializer, initargs) as executor:
+        for n, budget in enumerate(budgets):
+            settings: List[dict] = [dict(setting, **{budget_key: budget}) for setting in candidates]
+
+            round_callback: Callable = callback if n == len(budgets) - 1 else None
+            results: List[Tuple] = evaluate_settings(executor, evaluate_func, settings, round_callback, tracker)
+            evaluate_count += len(results)
+            output(f"预算{budget:.2f}评估完成，参数组合{len(results)}个")
+
+            # Keep best settings for next round
+            order: List[int] = sorted(range(len(results)), key=lambda i: key_func(results[i]), reverse=True)
+            keep: int = max(len(candidates) // eta, 1)
+            candidates = [candidates[i] for i in order[:keep]]
+
+    if tracker:
+        tracker.report(force=True)
+
+    results.sort(reverse=True, key=key_func)
+
+    end: int = perf_counter()
+    cost: int = int((end - start))
+    output(f"连续减半算法优化完成，耗时{cost}秒，评估次数{evaluate_count}")
+
+    return results
+
+
+class GaussianProcess:
+    """
+    Gaussian process regression with RBF kernel, used as surrogate model.
+    """
+
+    def __init__(self, noise: float = 1e-6) -> None:
+        """"""
+        self.noise: float = noise
+        self.length_scale: float = 0.2
+
+        self.x: np.ndarray = None
+        self.y_mean: float = 0
+        self.y_std: float = 1
+        self.cholesky: np.ndarray = None
+        self.alpha: np.ndarray = None
+
+    def kernel(self, a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+        """"""
+        distance: np.ndarray = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * distance / length_scale ** 2)
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Fit model, with length scale chosen by marginal likelihood.
+        """
+        self.x = x
+        self.y_mean = y.mean()
+        self.y_std = y.std() or 1
+        y = (y - self.y_mean) / self.y_std
+
+        best_likelihood: float = -np.inf
+
+        for length_scale in [0.05, 0.1, 0.2, 0.5, 1.0]:
+            k: np.ndarray = self.kernel(x, x, length_scale) + np.eye(len(x)) * self.noise
+            try:
+                cholesky: np.ndarray = np.linalg.cholesky(k)
+            except np.linalg.LinAlgError:
+                continue
+
+            alpha: np.ndarray = np.linalg.solve(cholesky.T, np.linalg.solve(cholesky, y))
+            likelihood: float = -0.5 * y @ alpha - np.log(np.diag(cholesky)).sum()
+
+            if likelihood > best_likelihood:
+                best_likelihood = likelihood
+                self.length_scale = length_scale
+                self.cholesky = cholesky
+                self.alpha = alpha
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict mean and standard deviation.
+        """
+        k: np.ndarray = self.kernel(x, self.x, self.length_scale)
+        mean: np.ndarray = k @ self.alpha
+
+        v: np.ndarray = np.linalg.solve(self.cholesky, k.T)
+        var: np.ndarray = np.clip(1 - (v ** 2).sum(axis=0), 1e-12, None)
+
+        return mean * self.y_std + self.y_mean, np.sqrt(var) * self.y_std
+
+
+def calculate_expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.01) -> np.ndarray:
+    """"""
+    improvement: np.ndarray = mean - best - xi
+    z: np.ndarray = improvement / std
+
+    cdf: np.ndarray = 0.5 * (1 + np.vectorize(erf)(z / sqrt(2)))
+    pdf: np.ndarray = np.exp(-0.5 * z ** 2) / sqrt(2 * pi)
+
+    return improvement * cdf + std * pdf
+
+
+def run_bayes_optimization(
+    evaluate_func: EVALUATE_FUNC,
+    optimization_setting: OptimizationSetting,
+    key_func: KEY_FUNC,
+    max_workers: int = None,
+    n_calls: int = 100,
+    n_init: int = 0,
+    batch_size: int = 0,
+    candidate_size: int = 2000,
+    output: OUTPUT_FUNC = print,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    callback: Callable[[Tuple], None] = None,
+    executor: Executor = None,
+    progress_func: Callable[[OptimizationProgress], None] = None,
+    progress_interval: float = 1.0
+) -> List[Tuple]:
     """
-    Functions to be run in genetic algorithm optimization.
+    Run surrogate model optimization.
+
+    A gaussian process fitted on evaluated settings predicts targets of
+    randomly sampled candidates, and candidates with largest expected
+    improvement are evaluated next. Batches are picked by assuming
+    predicted mean as result of chosen candidates, so that each batch can
+    be evaluated in parallel.
+
+    Progress func is called with OptimizationProgress periodically.
     """
-    tp: tuple = tuple(parameters)
-    if tp in cache:
-        result: tuple = cache[tp]
+    space: ParameterSpace = optimization_setting.get_space()
+
+    n_calls = min(n_calls, len(space))
+    batch_size = batch_size or max_workers or cpu_count()
+    n_init = min(n_init or batch_size * 2, n_calls)
+
+    output("开始执行贝叶斯算法优化")
+    output(f"参数优化空间：{len(space)}")
+    output(f"评估次数上限：{n_calls}")
+
+    start: int = perf_counter()
+
+    indexes: List[int] = sample(range(len(space)), n_init)
+    evaluated: Dict[int, Tuple] = {}
+
+    tracker: ProgressTracker = create_tracker(n_calls, progress_func, progress_interval)
+
+    with get_executor(executor, max_workers, initializer, initargs) as executor:
+        while indexes:
+            results: List[Tuple] = evaluate_settings(
+                executor, evaluate_func, [space[i] for i in indexes], callback, tracker
+            )
+            evaluated.update(zip(indexes, results))
+
+            remaining: int = min(batch_size, n_calls - len(evaluated))
+            if remaining <= 0:
+                break
+
+            indexes = suggest_indexes(space, evaluated, key_func, remaining, candidate_size)
+            output(f"贝叶斯算法评估次数{len(evaluated)}，当前最优{max(key_func(r) for r in evaluated.values()):.4f}")
+
+    if tracker:
+        tracker.report(force=True)
+
+    results: List[Tuple] = list(evaluated.values())
+    results.sort(reverse=True, key=key_func)
+
+    end: int = perf_counter()
+    cost: int = int((end - start))
+    output(f"贝叶斯算法优化完成，耗时{cost}秒，评估次数{len(evaluated)}")
+
+    return results
+
+
+def suggest_indexes(
+    space: ParameterSpace,
+    evaluated: Dict[int, Tuple],
+    key_func: KEY_FUNC,
+    count: int,
+    candidate_size: int
+) -> List[int]:
+    """
+    Suggest settings with largest expected improvement for next batch.
+    """
+    x_indexes: List[int] = list(evaluated.keys())
+    x: np.ndarray = space.get_coordinates(x_indexes)
+    y: np.ndarray = np.array([key_func(evaluated[i]) for i in x_indexes], dtype=float)
+
+    # Sample candidates not evaluated yet
+    if len(space) - len(evaluated) <= candidate_size:
+        candidates: List[int] = [i for i in range(len(space)) if i not in evaluated]
     else:
-        setting: dict = dict(parameters)
-        result: dict = evaluate_func(setting)
-        cache[tp] = result
+        candidates = list({i for i in sample(range(len(space)), candidate_size) if i not in evaluated})
+
+    candidate_x: np.ndarray = space.get_coordinates(candidates)
+
+    model: GaussianProcess = GaussianProcess()
+    suggested: List[int] = []
+
+    for _ in range(min(count, len(candidates))):
+        model.fit(x, y)
+        mean, std = model.predict(candidate_x)
+        ei: np.ndarray = calculate_expected_improvement(mean, std, y.max())
+
+        n: int = int(ei.argmax())
+        suggested.append(candidates.pop(n))
+
+        # Believe predicted mean as result of chosen candidate
+        x = np.vstack([x, candidate_x[n]])
+        y = np.append(y, mean[n])
+        candidate_x = np.delete(candidate_x, n, axis=0)
+
+    return suggested
+
+
+@dataclass
+class WalkForwardWindow:
+    """
+    In-sample range for optimization and out-of-sample range for test.
+    """
+
+    index: int
+    train_start: datetime
+    train_end: datetime
+    test_start: datetime
+    test_end: datetime
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    Best in-sample setting of window and its out-of-sample result.
+    """
+
+    window: WalkForwardWindow
+    setting: dict
+    train_result: Tuple
+    test_result: Tuple
+
+
+def generate_walk_forward_windows(
+    start: datetime,
+    end: datetime,
+    train_size: timedelta,
+    test_size: timedelta,
+    step: timedelta = None,
+    anchored: bool = False
+) -> List[WalkForwardWindow]:
+    """
+    Generate rolling windows, or anchored windows with fixed train start.
+
+    Step defaults to test size, so that test ranges are contiguous and
+    can be stitched together.
+    """
+    step = step or test_size
+
+    windows: List[WalkForwardWindow] = []
+    train_start: datetime = start
+
+    while True:
+        train_end: datetime = train_start + train_size
+        test_end: datetime = train_end + test_size
+        if test_end > end:
+            break
+
+        window: WalkForwardWindow = WalkForwardWindow(
+            index=len(windows),
+            train_start=start if anchored else train_start,
+            train_end=train_end,
+            test_start=train_end,
+            test_end=test_end
+        )
+        windows.append(window)
+
+        train_start += step
+
+    return windows
+
+
+def run_walk_forward_optimization(
+    evaluate_func: EVALUATE_FUNC,
+    optimization_setting: OptimizationSetting,
+    key_func: KEY_FUNC,
+    windows: List[WalkForwardWindow],
+    max_workers: int = None,
+    output: OUTPUT_FUNC = print,
+    chunk_size: int = 1,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    start_key: str = "start",
+    end_key: str = "end",
+    executor: Executor = None,
+    progress_func: Callable[[OptimizationProgress], None] = None,
+    progress_interval: float = 1.0
+) -> List[WalkForwardResult]:
+    """
+    Run walk forward optimization.
+
+    Brute force optimization of all windows runs on one executor at the
+    same time, then best setting of each window is tested out of sample
+    in parallel. Range of data to be used is passed to evaluate_func in
+    setting with start_key and end_key, so that data preloaded by
+    initializer, e.g. load_worker_data, can be shared by all windows.
+
+    Results are returned in window order, as stitched out-of-sample runs.
+    """
+    space: ParameterSpace = optimization_setting.get_space()
+
+    output("开始执行滚动窗口优化")
+    output(f"参数优化空间：{len(space)}")
+    output(f"滚动窗口数量：{len(windows)}")
+
+    def iter_tasks() -> Iterator[Tuple[int, dict]]:
+        """
+        Iterate in-sample settings of all windows.
+        """
+        for n, window in enumerate(windows):
+            for setting in space:
+                yield n, dict(setting, **{start_key: window.train_start, end_key: window.train_end})
+
+    total: int = len(space) * len(windows) + len(windows)
+    tracker: ProgressTracker = create_tracker(total, progress_func, progress_interval)
+
+    start: int = perf_counter()
+
+    # Only best result of each window is kept
+    best: Dict[int, Tuple[dict, Tuple]] = {}
+
+    with get_executor(executor, max_workers, initializer, initargs) as executor:
+        max_pending: int = (max_workers or cpu_count()) * 4
+        chunk_func: Callable = partial(evaluate_chunk, partial(evaluate_indexed, evaluate_func))
+        chunks: Iterator[List[Tuple[int, dict]]] = iter_chunks(iter_tasks(), chunk_size)
+
+        with tqdm(total=len(space) * len(windows)) as progress:
+            for items, chunk_results in imap_unordered(executor, chunk_func, chunks, max_pending, tracker):
+                for (n, setting), result in zip(items, chunk_results):
+                    if n not in best or key_func(result) > key_func(best[n][1]):
+                        best[n] = (setting, result)
+
+                progress.update(len(chunk_results))
+
+        output("样本内优化完成，开始样本外测试")
+
+        settings: List[dict] = []
+        for n, window in enumerate(windows):
+            setting: dict = dict(best[n][0], **{start_key: window.test_start, end_key: window.test_end})
+            settings.append(setting)
+
+        test_results: List[Tuple] = evaluate_settings(executor, evaluate_func, settings, tracker=tracker)
+
+    if tracker:
+        tracker.report(force=True)
+
+    results: List[WalkForwardResult] = []
+    for n, window in enumerate(windows):
+        setting: dict = {k: v for k, v in best[n][0].items() if k not in {start_key, end_key}}
+        result: WalkForwardResult = WalkForwardResult(window, setting, best[n][1], test_results[n])
+        results.append(result)
+
+    end: int = perf_counter()
+    cost: int = int((end - start))
+    output(f"滚动窗口优化完成，耗时{cost}秒")
+
+    return results
+
+
+def stitch_walk_forward_results(results: List[WalkForwardResult], names: List[str]) -> Dict[str, list]:
+    """
+    Stitch out-of-sample results into columns, with statistics of names.
+    """
+    data: Dict[str, list] = {"test_start": [], "test_end": [], "setting": []}
+    for name in names:
+        data[name] = []
+
+    for result in results:
+        data["test_start"].append(result.window.test_start)
+        data["test_end"].append(result.window.test_end)
+        data["setting"].append(result.setting)
+
+        statistics: dict = result.test_result[-1]
+        for name in names:
+            data[name].append(statistics.get(name, None))
+
+    return data
+
+
+def get_fingerprint(
+    evaluate_func: Callable,
+    optimization_setting: "OptimizationSetting",
+    run_key: str = "",
+    *extra: object
+) -> str:
+    """
+    Hash evaluate function, parameter space, targets and run key, which
+    identifies the task whose results are saved into checkpoint.
+
+    Arguments bound by partial are included with memory addresses removed,
+    while data range and other state not visible from arguments should be
+    passed in run_key.
+    """
+    parts: List[str] = []
+
+    func: Callable = evaluate_func
+    while isinstance(func, partial):
+        parts.append(repr(func.args))
+        parts.append(repr(sorted(func.keywords.items())))
+        func = func.func
+
+    parts.append(f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}")
+    parts.append(repr(sorted(optimization_setting.params.items())))
+    parts.append(repr(optimization_setting.target_name))
+    parts.append(repr(sorted(optimization_setting.targets.items())))
+    parts.append(run_key)
+    parts.extend(repr(e) for e in extra)
+
+    text: str = ADDRESS_PATTERN.sub("", "|".join(parts))
+    return sha1(text.encode("UTF-8")).hexdigest()
+
+
+def load_checkpoint(name: str, fingerprint: str, output: OUTPUT_FUNC = print) -> dict:
+    """
+    Load checkpoint data pickled in trader dir, ignored if saved by another task.
+    """
+    if not name:
+        return {}
+
+    file_path: Path = get_folder_path("optimize").joinpath(f"{name}.pkl")
+    if not file_path.exists():
+        return {}
+
+    with open(file_path, "rb") as f:
+        checkpoint: dict = pickle.load(f)
+
+    if checkpoint.get("fingerprint", "") != fingerprint:
+        output(f"检查点{name}与当前优化任务不一致，已忽略")
+        return {}
+
+    return checkpoint["data"]
+
+
+def save_checkpoint(name: str, data: dict, fingerprint: str) -> None:
+    """
+    Pickle checkpoint data with task fingerprint into trader dir, replacing
+    old file atomically.
+    """
+    file_path: Path = get_folder_path("optimize").joinpath(f"{name}.pkl")
+    temp_path: Path = file_path.with_suffix(".tmp")
+
+    with open(temp_path, "wb") as f:
+        pickle.dump({"fingerprint": fingerprint, "data": data}, f)
 
-    value: float = key_func(result)
-    return (value, )
+    temp_path.replace(file_path)
@@ -0,0 +1,236 @@
+"""
+Columnar query with predicates over daily statistic data.
+"""
+
+import operator
+import re
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+
+OPERATORS: Dict[str, Callable] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+PREDICATE_PATTERN: re.Pattern = re.compile(r"^\s*(\w+)\s*(>=|<=|==|!=|>|<)\s*(\S+)\s*$")
+
+PREDICATE = Union[str, Tuple[str, str, Union[str, float]]]
+
+
+def parse_predicate(predicate: PREDICATE) -> Tuple[str, str, Union[str, float]]:
+    """
+    Parse predicate like "ma20 > close" or ("volume_ratio", ">", 2).
+
+    Right side is compared as column if a column with the name exists,
+    otherwise as constant value.
+    """
+    if isinstance(predicate, str):
+        result: re.Match = PREDICATE_PATTERN.match(predicate)
+        if not result:
+            raise ValueError(f"无法解析查询条件：{predicate}")
+        left, op, right = result.groups()
+    else:
+        left, op, right = predicate
+
+    if op not in OPERATORS:
+        raise ValueError(f"不支持的比较运算符：{op}")
+
+    # Enum columns are compared by value
+    if isinstance(right, Enum):
+        right = right.value
+
+    return left, op, right
+
+
+class DateSlice:
+    """
+    Column arrays of all records on the same date, with sorted indexes
+    built lazily for constant comparisons.
+    """
+
+    def __init__(self, records: list) -> None:
+        """"""
+        self.records: list = records
+        self.columns: Dict[str, np.ndarray] = {}
+        self.orders: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def get_column(self, name: str) -> np.ndarray:
+        """"""
+        array: np.ndarray = self.columns.get(name, None)
+        if array is None:
+            values: list = [getattr(record, name, None) for record in self.records]
+            values = [v.value if isinstance(v, Enum) else v for v in values]
+            if any(isinstance(v, str) for v in values):
+                array = np.array(values, dtype=object)
+            else:
+                try:
+                    array = np.array(values, dtype=float)
+                except (TypeError, ValueError):
+                    array = np.array(values, dtype=object)
+            self.columns[name] = array
+        return array
+
+    def get_order(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get row order sorted by column value and sorted values, NaN excluded.
+        """
+        result: Tuple[np.ndarray, np.ndarray] = self.orders.get(name, None)
+        if result is None:
+            array: np.ndarray = self.get_column(name)
+            order: np.ndarray = np.argsort(array, kind="stable")
+            valid: int = int((~np.isnan(array)).sum())
+            order = order[:valid]
+            result = (order, array[order])
+            self.orders[name] = result
+        return result
+
+    def match_constant(self, name: str, op: str, value: float) -> np.ndarray:
+        """
+        Get mask of rows matching column compared with constant by binary search.
+        """
+        order, values = self.get_order(name)
+        mask: np.ndarray = np.zeros(len(self.records), dtype=bool)
+
+        if op == ">":
+            rows: np.ndarray = order[np.searchsorted(values, value, side="right"):]
+        elif op == ">=":
+            rows: np.ndarray = order[np.searchsorted(values, value, side="left"):]
+        elif op == "<":
+            rows: np.ndarray = order[:np.searchsorted(values, value, side="left")]
+        elif op == "<=":
+            rows: np.ndarray = order[:np.searchsorted(values, value, side="right")]
+        elif op == "==":
+            left: int = np.searchsorted(values, value, side="left")
+            right: int = np.searchsorted(values, value, side="right")
+            rows: np.ndarray = order[left:right]
+        else:
+            mask[order] = True
+            left: int = np.searchsorted(values, value, side="left")
+            right: int = np.searchsorted(values, value, side="right")
+            mask[order[left:right]] = False
+            return mask
+
+        mask[rows] = True
+        return mask
+
+    def match(self, predicates: List[Tuple[str, str, Any]]) -> np.ndarray:
+        """
+        Get mask of rows matching all predicates.
+        """
+        mask: np.ndarray = np.ones(len(self.records), dtype=bool)
+
+        for left, op, right in predicates:
+            column: np.ndarray = self.get_column(left)
+
+            if isinstance(right, str) and hasattr(self.records[0], right):
+                mask &= OPERATORS[op](column, self.get_column(right))
+            elif column.dtype == object:
+                mask &= OPERATORS[op](column, right)
+            else:
+                try:
+                    value: float = float(right)
+                except ValueError:
+                    raise ValueError(f"查询条件右侧既不是字段也不是数值：{right}")
+                mask &= self.match_constant(left, op, value)
+
+            if not mask.any():
+                break
+
+        return mask
+
+
+class DailyStatIndex:
+    """
+    In-memory index of daily statistic data partitioned by date.
+
+    Built once from loaded records, it can be queried repeatedly with
+    column projections and predicates, returning matching rows in columnar
+    form.
+    """
+
+    def __init__(self, records: list, date_field: str = "datetime") -> None:
+        """"""
+        groups: Dict[date, list] = {}
+        for record in records:
+            dt = getattr(record, date_field)
+            if isinstance(dt, datetime):
+                dt = dt.date()
+            groups.setdefault(dt, []).append(record)
+
+        self.dates: List[date] = sorted(groups.keys())
+        self.slices: Dict[date, DateSlice] = {d: DateSlice(groups[d]) for d in self.dates}
+
+        self.sample: Any = records[0] if records else None
+
+    def check_columns(self, names: List[str]) -> None:
+        """
+        Raise ValueError if any column name is not a field of records.
+        """
+        if self.sample is None:
+            return
+
+        for name in names:
+            if not hasattr(self.sample, name):
+                raise ValueError(f"查询字段不存在：{name}")
+
+    def query(
+        self,
+        columns: List[str],
+        predicates: List[PREDICATE] = None,
+        start: date = None,
+        end: date = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return requested columns of rows matching predicates, with date column.
+        """
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+
+        parsed: List[Tuple[str, str, Any]] = [parse_predicate(p) for p in predicates or []]
+        self.check_columns(columns + [left for left, _, _ in parsed])
+
+        results: Dict[str, list] = {name: [] for name in ["date"] + columns}
+
+        for d in self.dates:
+            if (start and d < start) or (end and d > end):
+                continue
+
+            date_slice: DateSlice = self.slices[d]
+            mask: np.ndarray = date_slice.match(parsed)
+
+            count: int = int(mask.sum())
+            if not count:
+                continue
+
+            results["date"].append(np.full(count, d, dtype="datetime64[D]"))
+            for name in columns:
+                results[name].append(date_slice.get_column(name)[mask])
+
+        data: Dict[str, np.ndarray] = {}
+        for name, arrays in results.items():
+            if arrays:
+                data[name] = np.concatenate(arrays)
+            elif name == "date":
+                data[name] = np.array([], dtype="datetime64[D]")
+            else:
+                data[name] = np.array([], dtype=self.get_dtype(name))
+
+        return data
+
+    def get_dtype(self, name: str) -> np.dtype:
+        """
+        Get dtype of column converted from value of sample record.
+        """
+        if self.sample is None:
+            return np.dtype(float)
+        return DateSlice([self.sample]).get_column(name).dtype
@@ -0,0 +1,224 @@
+"""
+Trading session calendar used for bar aggregation.
+"""
+
+import re
+from datetime import datetime, time
+from typing import Dict, List, Tuple
+
+from .constant import Exchange
+
+
+MINUTES_PER_DAY: int = 24 * 60
+
+
+def time_to_minute(t: time) -> int:
+    """
+    Convert time object to minute of day.
+    """
+    return t.hour * 60 + t.minute
+
+
+class SessionCalendar:
+    """
+    Precomputed minute table of trading sessions.
+
+    Every minute of day is mapped to its ordinal within the trading day
+    (-1 for minutes outside sessions), so window boundaries of any N-minute
+    bar can be decided by lookup instead of datetime arithmetic.
+
+    Sessions are given in trading day order as (start, end) pairs. Minute
+    bars are labelled by their start time, so the end time itself is not
+    included, except that a bar labelled exactly at session end is folded
+    into the last minute of the session, sharing its ordinal. BarGenerator
+    holds window ending at such last minute until the folded bar arrives,
+    so that it is merged before push. Night sessions may cross midnight.
+    """
+
+    def __init__(self, sessions: List[Tuple[time, time]]) -> None:
+        """"""
+        self.sessions: List[Tuple[time, time]] = sessions
+
+        self.ordinals: List[int] = [-1] * MINUTES_PER_DAY
+        self.count: int = 0
+
+        for start, end in sessions:
+            start_minute: int = time_to_minute(start)
+            end_minute: int = time_to_minute(end)
+
+            length: int = (end_minute - start_minute) % MINUTES_PER_DAY
+            for i in range(length):
+                minute: int = (start_minute + i) % MINUTES_PER_DAY
+                self.ordinals[minute] = self.count
+                self.count += 1
+
+        # Fold bar labelled at session end into the last session minute
+        self.fold_lasts: List[bool] = [False] * MINUTES_PER_DAY
+
+        for start, end in sessions:
+            end_minute: int = time_to_minute(end)
+            last_minute: int = (end_minute - 1) % MINUTES_PER_DAY
+            if self.ordinals[end_minute] < 0:
+                self.ordinals[end_minute] = self.ordinals[last_minute]
+                self.fold_lasts[last_minute] = True
+
+        self.window_ends: Dict[int, List[bool]] = {}
+
+    def get_ordinal(self, dt: datetime) -> int:
+        """
+        Get ordinal of the minute within trading day, -1 if not trading.
+        """
+        return self.ordinals[dt.hour * 60 + dt.minute]
+
+    def get_window_ends(self, window: int) -> List[bool]:
+        """
+        Get lookup table of window end flags for N-minute window.
+        """
+        window_ends: List[bool] = self.window_ends.get(window, None)
+        if window_ends:
+            return window_ends
+
+        last: int = self.count - 1
+        window_ends = [
+            ordinal >= 0 and (not (ordinal + 1) % window or ordinal == last)
+            for ordinal in self.ordinals
+        ]
+
+        self.window_ends[window] = window_ends
+        return window_ends
+
+    def get_window_index(self, dt: datetime, window: int) -> int:
+        """
+        Get index of N-minute window within trading day, -1 if not trading.
+        """
+        ordinal: int = self.ordinals[dt.hour * 60 + dt.minute]
+        if ordinal < 0:
+            return -1
+        return ordinal // window
+
+    def is_window_end(self, dt: datetime, window: int) -> bool:
+        """
+        Check if minute is the last one of N-minute window.
+        """
+        return self.get_window_ends(window)[dt.hour * 60 + dt.minute]
+
+    def is_fold_last(self, dt: datetime) -> bool:
+        """
+        Check if minute is followed by bar labelled at session end folded into it.
+        """
+        return self.fold_lasts[dt.hour * 60 + dt.minute]
+
+    def is_day_end(self, dt: datetime) -> bool:
+        """
+        Check if minute is the last one of trading day.
+        """
+        return self.ordinals[dt.hour * 60 + dt.minute] == self.count - 1
+
+
+STOCK_CALENDAR: SessionCalendar = SessionCalendar([
+    (time(9, 30), time(11, 30)),
+    (time(13, 0), time(15, 0)),
+])
+
+FUTURES_CALENDAR: SessionCalendar = SessionCalendar([
+    (time(9, 0), time(10, 15)),
+    (time(10, 30), time(11, 30)),
+    (time(13, 30), time(15, 0)),
+])
+
+
+def _create_night_calendar(night_end: time) -> SessionCalendar:
+    """"""
+    return SessionCalendar([
+        (time(21, 0), night_end),
+        (time(9, 0), time(10, 15)),
+        (time(10, 30), time(11, 30)),
+        (time(13, 30), time(15, 0)),
+    ])
+
+
+NIGHT_2300_CALENDAR: SessionCalendar = _create_night_calendar(time(23, 0))
+NIGHT_0100_CALENDAR: SessionCalendar = _create_night_calendar(time(1, 0))
+NIGHT_0230_CALENDAR: SessionCalendar = _create_night_calendar(time(2, 30))
+
+
+EXCHANGE_CALENDARS: Dict[Exchange, SessionCalendar] = {
+    Exchange.SSE: STOCK_CALENDAR,
+    Exchange.SZSE: STOCK_CALENDAR,
+    Exchange.BSE: STOCK_CALENDAR,
+    Exchange.CFFEX: STOCK_CALENDAR,
+    Exchange.SHFE: FUTURES_CALENDAR,
+    Exchange.DCE: FUTURES_CALENDAR,
+    Exchange.CZCE: FUTURES_CALENDAR,
+    Exchange.INE: FUTURES_CALENDAR,
+    Exchange.GFEX: FUTURES_CALENDAR,
+}
+
+PRODUCT_CALENDARS: Dict[Tuple[Exchange, str], SessionCalendar] = {}
+
+for product in ["au", "ag"]:
+    PRODUCT_CALENDARS[(Exchange.SHFE, product)] = NIGHT_0230_CALENDAR
+
+for product in ["cu", "al", "zn", "pb", "ni", "sn", "ss", "ao"]:
+    PRODUCT_CALENDARS[(Exchange.SHFE, product)] = NIGHT_0100_CALENDAR
+
+for product in ["rb", "hc", "bu", "ru", "fu", "sp", "br"]:
+    PRODUCT_CALENDARS[(Exchange.SHFE, product)] = NIGHT_2300_CALENDAR
+
+for product in ["sc"]:
+    PRODUCT_CALENDARS[(Exchange.INE, product)] = NIGHT_0230_CALENDAR
+
+for product in ["bc"]:
+    PRODUCT_CALENDARS[(Exchange.INE, product)] = NIGHT_0100_CALENDAR
+
+for product in ["nr", "lu"]:
+    PRODUCT_CALENDARS[(Exchange.INE, product)] = NIGHT_2300_CALENDAR
+
+for product in [
+    "a", "b", "m", "y", "p", "c", "cs", "rr", "jm", "j", "i",
+    "l", "v", "pp", "eg", "eb", "pg"
+]:
+    PRODUCT_CALENDARS[(Exchange.DCE, product)] = NIGHT_2300_CALENDAR
+
+for product in [
+    "SR", "CF", "CY", "RM", "OI", "TA", "MA", "FG",
+    "SA", "ZC", "PF", "PX", "SH"
+]:
+    PRODUCT_CALENDARS[(Exchange.CZCE, product)] = NIGHT_2300_CALENDAR
+
+
+def extract_product(symbol: str) -> str:
+    """
+    Get product code from futures symbol, e.g. rb2410 -> rb.
+    """
+    result: re.Match = re.match(r"[a-zA-Z]+", symbol)
+    if not result:
+        return ""
+    return result.group()
+
+
+def register_session_calendar(
+    calendar: SessionCalendar,
+    exchange: Exchange,
+    product: str = ""
+) -> None:
+    """
+    Register session calendar for exchange or product of exchange.
+    """
+    if product:
+        PRODUCT_CALENDARS[(exchange, product)] = calendar
+    else:
+        EXCHANGE_CALENDARS[exchange] = calendar
+
+
+def get_session_calendar(exchange: Exchange, symbol: str = "") -> SessionCalendar:
+    """
+    Get session calendar of symbol, fall back to exchange default.
+    """
+    if symbol:
+        product: str = extract_product(symbol)
+        calendar: SessionCalendar = PRODUCT_CALENDARS.get((exchange, product), None)
+        if calendar:
+            return calendar
+
+    return EXCHANGE_CALENDARS.get(exchange, None)
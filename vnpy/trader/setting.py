@@ -28,6 +28,8 @@ SETTINGS: Dict[str, Any] = {
     "datafeed.name": "",
     "datafeed.username": "",
     "datafeed.password": "",
+    "datafeed.cache": False,
+    "datafeed.cache.size": 1024,
 
     "database.timezone": get_localzone_name(),
     "database.name": "sqlite",
@@ -36,6 +38,10 @@ SETTINGS: Dict[str, Any] = {
     "database.port": 0,
     "database.user": "",
     "database.password": "",
+    "database.cache": False,
+    "database.cache.size": 2048,
+    "database.pool_size": 4,
+    "database.pool_timeout": 30,
     "level2data.username": "",
     "level2data.password": ""
 }
@@ -0,0 +1,192 @@
+"""
+Incremental synchronization of history data from datafeed into database.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Dict, List, Tuple
+
+from .constant import Interval, Exchange, Conflict
+from .object import BarData, HistoryRequest
+from .database import BaseDatabase, BarOverview, get_database, to_db_time
+from .datafeed import BaseDatafeed, get_datafeeds
+from .utility import extract_vt_symbol, exchange_to_market, load_json, save_json
+
+
+class HistorySynchronizer:
+    """
+    Fill gaps between bar data in database and requested range.
+
+    Missing ranges of each symbol are computed from bar overview, only
+    those ranges are queried from datafeed and saved with Conflict.IGNORE.
+    Finished symbols are recorded in journal file in trader dir, so that an
+    interrupted sync can be resumed without querying them again.
+    """
+
+    def __init__(
+        self,
+        database: BaseDatabase = None,
+        datafeeds: Dict = None,
+        max_workers: int = 4,
+        journal_name: str = "history_sync.json",
+        output: Callable = print
+    ) -> None:
+        """"""
+        self.database: BaseDatabase = database or get_database()
+        self.datafeeds: Dict = datafeeds or get_datafeeds()
+        self.max_workers: int = max_workers
+        self.journal_name: str = journal_name
+        self.output: Callable = output
+
+        self.journal: dict = load_json(journal_name)
+        self.lock: Lock = Lock()
+
+    def get_overviews(self, stype: str) -> Dict[Tuple[str, Interval], BarOverview]:
+        """
+        Query all bar overviews once, keyed by vt_symbol and interval.
+        """
+        overviews: Dict[Tuple[str, Interval], BarOverview] = {}
+        for overview in self.database.get_bar_overview(stype=stype):
+            vt_symbol: str = f"{overview.symbol}.{overview.exchange.value}"
+            overviews[(vt_symbol, overview.interval)] = overview
+        return overviews
+
+    def get_missing_ranges(
+        self,
+        overview: BarOverview,
+        start: datetime,
+        end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Get ranges not covered by bar data in database.
+
+        Boundary bars are included in both sides of ranges, which will be
+        ignored by database when saving.
+        """
+        start = to_db_time(start)
+        end = to_db_time(end)
+
+        if not overview or not overview.count:
+            return [(start, end)]
+
+        ranges: List[Tuple[datetime, datetime]] = []
+
+        overview_start: datetime = to_db_time(overview.start)
+        overview_end: datetime = to_db_time(overview.end)
+
+        if start < overview_start:
+            ranges.append((start, min(overview_start, end)))
+
+        if end > overview_end:
+            ranges.append((max(overview_end, start), end))
+
+        return ranges
+
+    def get_task_key(self, interval: Interval, start: datetime, end: datetime, stype: str) -> str:
+        """"""
+        return f"{stype}_{interval.value}_{start:%Y%m%d%H%M}_{end:%Y%m%d%H%M}"
+
+    def sync_bar_data(
+        self,
+        vt_symbols: List[str],
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        stype: str = "CS",
+        index: bool = False
+    ) -> Dict[str, int]:
+        """
+        Sync bar data of symbols concurrently, return count of bars downloaded.
+
+        Symbols failed in query or save are not journaled and will be synced
+        again in next run.
+        """
+        task_key: str = self.get_task_key(interval, start, end, stype)
+        finished: Dict[str, int] = self.journal.setdefault(task_key, {})
+
+        overviews: Dict[Tuple[str, Interval], BarOverview] = self.get_overviews(stype)
+
+        pending: List[str] = [vt_symbol for vt_symbol in vt_symbols if vt_symbol not in finished]
+        self.output(f"开始同步历史数据，总数{len(vt_symbols)}，已完成{len(vt_symbols) - len(pending)}")
+
+        failed: List[str] = []
+
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            futures: Dict[Future, str] = {}
+
+            for vt_symbol in pending:
+                ranges: List[Tuple[datetime, datetime]] = self.get_missing_ranges(
+                    overviews.get((vt_symbol, interval), None), start, end
+                )
+                future: Future = executor.submit(self.sync_symbol, vt_symbol, interval, ranges, index)
+                futures[future] = vt_symbol
+
+            for future in as_completed(futures):
+                vt_symbol: str = futures[future]
+
+                try:
+                    count: int = future.result()
+                except Exception as e:      # noqa
+                    self.output(f"{vt_symbol}历史数据同步失败：{e}")
+                    failed.append(vt_symbol)
+                    continue
+
+                with self.lock:
+                    finished[vt_symbol] = count
+                    save_json(self.journal_name, self.journal)
+
+        results: Dict[str, int] = {vt_symbol: finished.get(vt_symbol, 0) for vt_symbol in vt_symbols}
+
+        # Clear journal of task once all symbols finished
+        if len(finished) >= len(set(vt_symbols)):
+            self.journal.pop(task_key)
+            save_json(self.journal_name, self.journal)
+
+        self.output(f"历史数据同步完成，下载{sum(results.values())}条，失败{len(failed)}个")
+        if failed:
+            self.output(f"同步失败的合约将在下次运行时重试：{failed}")
+        return results
+
+    def sync_symbol(
+        self,
+        vt_symbol: str,
+        interval: Interval,
+        ranges: List[Tuple[datetime, datetime]],
+        index: bool
+    ) -> int:
+        """
+        Query missing ranges of one symbol from datafeed and save.
+        """
+        symbol, exchange = extract_vt_symbol(vt_symbol)
+        datafeed: BaseDatafeed = self.get_datafeed(exchange)
+
+        count: int = 0
+
+        for start, end in ranges:
+            req: HistoryRequest = HistoryRequest(
+                symbol=symbol,
+                exchange=exchange,
+                start=start,
+                end=end,
+                interval=interval
+            )
+
+            if index:
+                bars: List[BarData] = datafeed.query_index_bar_history(req, self.output)
+            else:
+                bars: List[BarData] = datafeed.query_bar_history(req, self.output)
+
+            # None means query failed, while empty list means no new data
+            if bars is None:
+                raise RuntimeError(f"数据服务查询失败，区间{start}至{end}")
+
+            if bars:
+                self.database.save_bar_data(bars, conflict=Conflict.IGNORE)
+                count += len(bars)
+
+        return count
+
+    def get_datafeed(self, exchange: Exchange) -> BaseDatafeed:
+        """"""
+        return self.datafeeds[exchange_to_market(exchange)]
@@ -9,7 +9,7 @@ from datetime import datetime, time
 from datetime import date
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from typing import Callable, Dict, List, Tuple, Union, Optional
 from decimal import Decimal
 from math import floor, ceil
 
@@ -18,6 +18,7 @@ import talib
 
 from .object import BarData, TickData, BaseData
 from .constant import Exchange, Interval, Market, Direction, Offset, OrderType, Status
+from .session import SessionCalendar
 
 if sys.version_info >= (3, 9):
     from zoneinfo import ZoneInfo, available_timezones  # noqa
@@ -240,6 +241,10 @@ class BarGenerator:
     Notice:
     1. for x minute bar, x must be able to divide 60: 2, 3, 5, 6, 10, 15, 20, 30
     2. for x hour bar, x can be any number
+    3. with session calendar passed, x minute bar can be any number and window
+       boundaries follow trading sessions, daily_end is not required
+    4. with session calendar passed, bar ending at last minute of session is
+       held until bar labelled at session end (e.g. 15:00) or next bar arrives
     """
 
     def __init__(
@@ -248,7 +253,8 @@ class BarGenerator:
         window: int = 0,
         on_window_bar: Callable = None,
         interval: Interval = Interval.MINUTE,
-        daily_end: time = None
+        daily_end: time = None,
+        calendar: SessionCalendar = None
     ) -> None:
         """Constructor"""
         self.bar: BarData = None
@@ -265,70 +271,87 @@ class BarGenerator:
         self.on_window_bar: Callable = on_window_bar
 
         self.last_tick: TickData = None
+        self.bar_minute: int = -1
 
         self.daily_end: time = daily_end
-        if self.interval == Interval.DAILY and not self.daily_end:
+        self.calendar: SessionCalendar = calendar
+        if self.interval == Interval.DAILY and not self.daily_end and not self.calendar:
             raise RuntimeError("合成日K线必须传入每日收盘时间")
 
+        self.window_index: int = -1
+        self.last_ordinal: int = -1
+        self.daily_last_dt: datetime = None
+
+        # Finished bar held at last minute of session for folded bar
+        self.held: bool = False
+
     def update_tick(self, tick: TickData) -> None:
         """
         Update new tick data into generator.
         """
-        new_minute: bool = False
+        last_price: float = tick.last_price
 
         # Filter tick data with 0 last price
-        if not tick.last_price:
+        if not last_price:
             return
 
+        dt: datetime = tick.datetime
+        last_tick: TickData = self.last_tick
+
         # Filter tick data with older timestamp
-        if self.last_tick and tick.datetime < self.last_tick.datetime:
+        if last_tick and dt < last_tick.datetime:
             return
 
-        if not self.bar:
-            new_minute = True
-        elif (
-                (self.bar.datetime.minute != tick.datetime.minute)
-                or (self.bar.datetime.hour != tick.datetime.hour)
-        ):
-            self.bar.datetime = self.bar.datetime.replace(
+        # Compare integer minute key instead of datetime fields
+        minute_key: int = dt.hour * 60 + dt.minute
+        bar: BarData = self.bar
+
+        if bar and minute_key != self.bar_minute:
+            bar.datetime = bar.datetime.replace(
                 second=0, microsecond=0
             )
-            self.on_bar(self.bar)
+            self.on_bar(bar)
 
-            new_minute = True
+            bar = None
 
-        if new_minute:
-            self.bar = BarData(
+        if not bar:
+            bar = BarData(
                 symbol=tick.symbol,
                 exchange=tick.exchange,
                 interval=Interval.MINUTE,
-                datetime=tick.datetime,
+                datetime=dt,
                 gateway_name=tick.gateway_name,
-                open_price=tick.last_price,
-                high_price=tick.last_price,
-                low_price=tick.last_price,
-                close_price=tick.last_price,
+                open_price=last_price,
+                high_price=last_price,
+                low_price=last_price,
+                close_price=last_price,
                 open_interest=tick.open_interest
             )
+            self.bar = bar
+            self.bar_minute = minute_key
         else:
-            self.bar.high_price = max(self.bar.high_price, tick.last_price)
-            if tick.high_price > self.last_tick.high_price:
-                self.bar.high_price = max(self.bar.high_price, tick.high_price)
+            if last_price > bar.high_price:
+                bar.high_price = last_price
+            if tick.high_price > last_tick.high_price and tick.high_price > bar.high_price:
+                bar.high_price = tick.high_price
 
-            self.bar.low_price = min(self.bar.low_price, tick.last_price)
-            if tick.low_price < self.last_tick.low_price:
-                self.bar.low_price = min(self.bar.low_price, tick.low_price)
+            if last_price < bar.low_price:
+                bar.low_price = last_price
+            if tick.low_price < last_tick.low_price and tick.low_price < bar.low_price:
+                bar.low_price = tick.low_price
 
-            self.bar.close_price = tick.last_price
-            self.bar.open_interest = tick.open_interest
-            self.bar.datetime = tick.datetime
+            bar.close_price = last_price
+            bar.open_interest = tick.open_interest
+            bar.datetime = dt
 
-        if self.last_tick:
-            volume_change: float = tick.volume - self.last_tick.volume
-            self.bar.volume += max(volume_change, 0)
+        if last_tick:
+            volume_change: float = tick.volume - last_tick.volume
+            if volume_change > 0:
+                bar.volume += volume_change
 
-            turnover_change: float = tick.turnover - self.last_tick.turnover
-            self.bar.turnover += max(turnover_change, 0)
+            turnover_change: float = tick.turnover - last_tick.turnover
+            if turnover_change > 0:
+                bar.turnover += turnover_change
 
         self.last_tick = tick
 
@@ -345,6 +368,20 @@ class BarGenerator:
 
     def update_bar_minute_window(self, bar: BarData) -> None:
         """"""
+        # Push unfinished window bar if new bar belongs to another window
+        if self.calendar:
+            ordinal: int = self.calendar.get_ordinal(bar.datetime)
+            if ordinal >= 0:
+                if self.window_bar and (
+                    ordinal // self.window != self.window_index
+                    or ordinal < self.last_ordinal
+                ):
+                    self.on_window_bar(self.window_bar)
+                    self.window_bar = None
+
+                self.window_index = ordinal // self.window
+                self.last_ordinal = ordinal
+
         # If not inited, create window bar object
         if not self.window_bar:
             dt: datetime = bar.datetime.replace(second=0, microsecond=0)
@@ -375,7 +412,15 @@ class BarGenerator:
         self.window_bar.open_interest = bar.open_interest
 
         # Check if window bar completed
-        if not (bar.datetime.minute + 1) % self.window:
+        if self.calendar:
+            finished: bool = self.calendar.is_window_end(bar.datetime, self.window)
+        else:
+            finished: bool = not (bar.datetime.minute + 1) % self.window
+
+        # Hold bar until folded bar merged, or pushed by bar of next window
+        self.held = bool(finished and self.calendar and self.calendar.is_fold_last(bar.datetime))
+
+        if finished and not self.held:
             self.on_window_bar(self.window_bar)
             self.window_bar = None
 
@@ -496,6 +541,14 @@ class BarGenerator:
 
     def update_bar_daily_window(self, bar: BarData) -> None:
         """"""
+        # Push unfinished daily bar if new bar belongs to next trading day
+        if self.calendar:
+            ordinal: int = self.calendar.get_ordinal(bar.datetime)
+            if ordinal >= 0:
+                if self.daily_bar and ordinal < self.last_ordinal:
+                    self.push_daily_bar()
+                self.last_ordinal = ordinal
+
         # If not inited, create daily bar object
         if not self.daily_bar:
             self.daily_bar = BarData(
@@ -524,17 +577,46 @@ class BarGenerator:
         self.daily_bar.turnover += bar.turnover
         self.daily_bar.open_interest = bar.open_interest
 
+        self.daily_last_dt = bar.datetime
+
         # Check if daily bar completed
-        if bar.datetime.time() == self.daily_end:
-            self.daily_bar.datetime = bar.datetime.replace(
-                hour=0,
-                minute=0,
-                second=0,
-                microsecond=0
-            )
-            self.on_window_bar(self.daily_bar)
+        if self.calendar:
+            finished: bool = self.calendar.is_day_end(bar.datetime)
+        else:
+            finished: bool = bar.datetime.time() == self.daily_end
+
+        self.held = bool(finished and self.calendar and self.calendar.is_fold_last(bar.datetime))
+
+        if finished and not self.held:
+            self.push_daily_bar()
+
+    def push_daily_bar(self) -> None:
+        """
+        Push daily bar with date of its last minute bar.
+        """
+        self.daily_bar.datetime = self.daily_last_dt.replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0
+        )
+        self.on_window_bar(self.daily_bar)
 
-            self.daily_bar = None
+        self.daily_bar = None
+
+    def flush_held_bar(self) -> None:
+        """
+        Push bar held for folded bar at session end, e.g. when data ends.
+        """
+        if not self.held:
+            return
+        self.held = False
+
+        if self.interval == Interval.DAILY:
+            self.push_daily_bar()
+        else:
+            self.on_window_bar(self.window_bar)
+            self.window_bar = None
 
     def generate(self) -> Optional[BarData]:
         """
@@ -550,6 +632,33 @@ class BarGenerator:
         return bar
 
 
+def aggregate_bars(
+    bars: List[BarData],
+    window: int,
+    calendar: SessionCalendar,
+    interval: Interval = Interval.MINUTE
+) -> List[BarData]:
+    """
+    Aggregate 1 minute bars into x minute/daily bars in batch, using the same
+    session calendar lookup as live bar generation.
+    """
+    results: List[BarData] = []
+
+    generator: BarGenerator = BarGenerator(
+        on_bar=None,
+        window=window,
+        on_window_bar=results.append,
+        interval=interval,
+        calendar=calendar
+    )
+
+    for bar in bars:
+        generator.update_bar(bar)
+    generator.flush_held_bar()
+
+    return results
+
+
 class ArrayManager(object):
     """
     For: